@@ -0,0 +1,42 @@
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth import authenticate, login
+from django.http import Http404
+from django.shortcuts import redirect
+from django.urls import reverse
+
+from project.ratelimit import rate_limit
+
+from . import views
+from .forms import LoginForm
+
+
+@rate_limit(
+    'login', per_ip=views.LOGIN_RATE_PER_IP,
+    per_username=views.LOGIN_RATE_PER_USERNAME,
+)
+async def login_create(request):
+    if not request.POST:
+        raise Http404()
+
+    form = LoginForm(request.POST)
+
+    if form.is_valid():
+        # O hash da senha (PBKDF2) e pesado: roda no pool de threads, fora
+        # do event loop e sem ocupar a thread compartilhada das views sync
+        authenticated_user = await sync_to_async(
+            authenticate, thread_sensitive=False
+        )(
+            username=form.cleaned_data.get('username', ''),
+            password=form.cleaned_data.get('password', ''),
+        )
+
+        if authenticated_user is not None:
+            messages.success(request, 'Você está logado com sucesso')
+            await sync_to_async(login)(request, authenticated_user)
+        else:
+            messages.error(request, 'Credenciais inválidas')
+    else:
+        messages.error(request, 'Usuário ou senha inválido(s)')
+
+    return redirect(reverse('authors:dashboard'))
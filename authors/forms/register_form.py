@@ -4,6 +4,7 @@ from django import forms
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 
+from authors.models import users_with_email
 from utils.django_forms import add_placeholder, strong_password
 
 
@@ -113,7 +114,7 @@ class RegisterForm(forms.ModelForm):
 
     def clean_email(self):
         email = self.cleaned_data.get('email', '')
-        exists = User.objects.filter(email=email).exists()
+        exists = users_with_email(email).exists()
 
         if exists:
             raise ValidationError(
@@ -0,0 +1,43 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Apaga as sessoes expiradas do banco em lotes, sem segurar o lock de '
+        'escrita do SQLite por muito tempo como o clearsessions'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0.0,
+            help='Segundos de espera entre lotes, para as requisicoes gravarem',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now).order_by()
+        deleted = 0
+
+        while True:
+            keys = list(
+                expired.values_list('session_key', flat=True)[
+                    :options['batch_size']
+                ]
+            )
+            if not keys:
+                break
+
+            # Cada DELETE e a propria transacao (autocommit)
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{deleted} sessao(oes) expirada(s) apagada(s).')
+        )
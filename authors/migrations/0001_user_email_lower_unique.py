@@ -0,0 +1,49 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+
+EMAIL_CONSTRAINT = models.UniqueConstraint(
+    Lower('email'),
+    condition=~Q(email=''),
+    name='auth_user_email_lower_uniq',
+)
+
+
+def check_duplicate_emails(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.exclude(email='').annotate(
+            email_lower=Lower('email'),
+        ).values('email_lower').annotate(
+            total=Count('id'),
+        ).filter(total__gt=1).values_list('email_lower', flat=True)[:20]
+    )
+
+    # Escolher qual conta fica com o email e decisao de quem administra
+    if duplicates:
+        raise RuntimeError(
+            'Emails repetidos (sem diferenciar maiusculas) impedem o indice '
+            f'unico; corrija antes de migrar: {", ".join(duplicates)}'
+        )
+
+
+def add_email_constraint(apps, schema_editor):
+    schema_editor.add_constraint(apps.get_model('auth', 'User'), EMAIL_CONSTRAINT)
+
+
+def remove_email_constraint(apps, schema_editor):
+    schema_editor.remove_constraint(
+        apps.get_model('auth', 'User'), EMAIL_CONSTRAINT,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunPython(add_email_constraint, remove_email_constraint),
+    ]
@@ -1,3 +1,15 @@
-from django.db import models
+from django.contrib.auth.models import User
+from django.db.models.functions import Lower
 
-# Create your models here.
+# auth_user e do Django: o indice unico em LOWER(email), ignorando emails
+# vazios, e criado por authors/migrations/0001_user_email_lower_unique.py
+
+
+def users_with_email(email):
+    """
+    Usuarios com o email, sem diferenciar maiusculas. O filtro repete a
+    expressao e a condicao do indice parcial para que o banco o use.
+    """
+    return User.objects.annotate(
+        email_lower=Lower('email'),
+    ).filter(email_lower=email.lower()).exclude(email='')
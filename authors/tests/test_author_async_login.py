@@ -0,0 +1,47 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+
+from authors import async_views
+
+
+@override_settings(ROOT_URLCONF='project.urls_async')
+class AuthorAsyncLoginTest(TransactionTestCase):
+    def test_async_urls_use_async_login_create(self):
+        view = resolve(reverse('authors:login_create'))
+        self.assertIs(view.func, async_views.login_create)
+
+    async def test_async_login_create_authenticates_user(self):
+        await sync_to_async(User.objects.create_user)(
+            username='maria', password='Senha123'
+        )
+
+        response = await self.async_client.post(
+            reverse('authors:login_create'),
+            {'username': 'maria', 'password': 'Senha123'},
+        )
+
+        self.assertRedirects(
+            response, reverse('authors:dashboard'),
+            fetch_redirect_response=False,
+        )
+        session = await sync_to_async(lambda: dict(self.async_client.session))()
+        self.assertIn('_auth_user_id', session)
+
+    async def test_async_login_create_rejects_wrong_password(self):
+        await sync_to_async(User.objects.create_user)(
+            username='maria', password='Senha123'
+        )
+
+        await self.async_client.post(
+            reverse('authors:login_create'),
+            {'username': 'maria', 'password': 'errada'},
+        )
+
+        session = await sync_to_async(lambda: dict(self.async_client.session))()
+        self.assertNotIn('_auth_user_id', session)
+
+    async def test_async_login_create_raises_404_on_get(self):
+        response = await self.async_client.get(reverse('authors:login_create'))
+        self.assertEqual(response.status_code, 404)
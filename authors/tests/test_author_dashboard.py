@@ -0,0 +1,114 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from recipes.caching import author_recipe_counts
+from recipes.models import Recipe
+from recipes.views import PER_PAGE
+
+
+class AuthorDashboardTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='maria', password='Senha123', email='maria@example.com',
+        )
+        self.client.login(username='maria', password='Senha123')
+        return super().setUp()
+
+    def make_recipes(self, count, author=None, is_published=False):
+        author = author or self.author
+        return [
+            Recipe.objects.create(
+                title=f'Receita {index}',
+                description='description',
+                slug=f'{author.username}-{is_published}-{index}',
+                preparation_time=10,
+                preparation_time_unit='Minutos',
+                servings=2,
+                servings_unit='Porções',
+                preparation_steps='passos',
+                is_published=is_published,
+                author=author,
+            )
+            for index in range(count)
+        ]
+
+    def get_dashboard(self, page=1):
+        return self.client.get(reverse('authors:dashboard') + f'?page={page}')
+
+    def test_dashboard_paginates_drafts_newest_first(self):
+        drafts = self.make_recipes(PER_PAGE + 2)
+
+        first = self.get_dashboard().context['recipes']
+        second = self.get_dashboard(page=2).context['recipes']
+
+        self.assertEqual(len(first), PER_PAGE)
+        self.assertEqual(first[0].id, drafts[-1].id)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(first.paginator.num_pages, 2)
+
+    def test_dashboard_renders_the_page_links_below_the_list(self):
+        self.make_recipes(PER_PAGE + 2)
+
+        content = self.get_dashboard().content.decode('utf-8')
+
+        # Uma vez so, dentro do bloco dos rascunhos e depois da lista
+        drafts = content[content.index('authors-dashboard-container'):]
+        self.assertEqual(content.count('href="?page=2"'), 1)
+        self.assertLess(drafts.index('</ul>'), drafts.index('href="?page=2"'))
+
+    def test_dashboard_shows_counts_per_status(self):
+        self.make_recipes(3)
+        self.make_recipes(2, is_published=True)
+
+        response = self.get_dashboard()
+
+        self.assertEqual(response.context['counts'], {'drafts': 3, 'published': 2})
+        self.assertIn('Rascunhos: 3', response.content.decode('utf-8'))
+
+    def test_cached_counts_leave_only_session_user_and_page_queries(self):
+        self.make_recipes(PER_PAGE + 2)
+        self.get_dashboard()
+
+        # Sessao, usuario e a pagina de rascunhos: nem aggregate nem COUNT
+        with self.assertNumQueries(3):
+            self.get_dashboard(page=2)
+
+    def test_listing_loads_only_the_columns_it_needs(self):
+        self.make_recipes(1)
+
+        [recipe] = self.get_dashboard().context['recipes']
+
+        self.assertIn('preparation_steps', recipe.get_deferred_fields())
+
+    def test_saving_a_recipe_invalidates_only_its_authors_counts(self):
+        other = User.objects.create_user(username='joao', email='j@x.com')
+        [draft] = self.make_recipes(1)
+        self.make_recipes(1, author=other)
+        author_recipe_counts(self.author.id)
+        author_recipe_counts(other.id)
+
+        draft.is_published = True
+        draft.save()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                author_recipe_counts(self.author.id),
+                {'drafts': 0, 'published': 1},
+            )
+        with self.assertNumQueries(0):
+            author_recipe_counts(other.id)
+
+    def test_moving_a_recipe_to_another_author_refreshes_both(self):
+        other = User.objects.create_user(username='joao', email='j@x.com')
+        [draft] = self.make_recipes(1)
+        author_recipe_counts(self.author.id)
+        author_recipe_counts(other.id)
+
+        draft.author = other
+        draft.save()
+
+        self.assertEqual(author_recipe_counts(self.author.id)['drafts'], 0)
+        self.assertEqual(author_recipe_counts(other.id)['drafts'], 1)
@@ -0,0 +1,97 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from authors.models import users_with_email
+from authors.views import REGISTER_CONFLICT_ERROR
+
+
+class AuthorEmailUniquenessTest(TestCase):
+    def setUp(self) -> None:
+        self.form_data = {
+            'username': 'maria',
+            'first_name': 'Maria',
+            'last_name': 'Santos',
+            'email': 'Maria@Example.com',
+            'password': 'Abc123456@!',
+            'password_confirm': 'Abc123456@!',
+        }
+        return super().setUp()
+
+    def test_register_rejects_email_that_differs_only_in_case(self):
+        User.objects.create_user(username='outra', email='maria@example.com')
+
+        response = self.client.post(
+            reverse('authors:register_create'), self.form_data, follow=True,
+        )
+
+        self.assertIn(
+            'O email já está em uso.', response.context['form'].errors['email'],
+        )
+        self.assertFalse(User.objects.filter(username='maria').exists())
+
+    def test_database_enforces_case_insensitive_uniqueness(self):
+        User.objects.create_user(username='outra', email='maria@example.com')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(username='maria', email='MARIA@example.com')
+
+    def test_users_without_email_do_not_collide(self):
+        User.objects.create_user(username='um')
+        User.objects.create_user(username='dois')
+
+        self.assertFalse(users_with_email('').exists())
+
+    def test_lookup_uses_the_lower_email_index(self):
+        plan = users_with_email('Maria@Example.com').explain()
+
+        self.assertIn('auth_user_email_lower_uniq', plan)
+
+    def test_register_race_past_the_form_check_shows_the_form_error(self):
+        User.objects.create_user(username='outra', email='maria@example.com')
+
+        # A outra requisicao grava entre a validacao e o INSERT: so a
+        # primeira consulta deixa de ver o email
+        lookups = [User.objects.none()]
+
+        def racing_lookup(email):
+            return lookups.pop() if lookups else users_with_email(email)
+
+        with patch(
+            'authors.forms.register_form.users_with_email',
+            side_effect=racing_lookup,
+        ):
+            response = self.client.post(
+                reverse('authors:register_create'), self.form_data,
+            )
+
+        self.assertRedirects(
+            response, reverse('authors:register'),
+            fetch_redirect_response=False,
+        )
+        self.assertFalse(User.objects.filter(username='maria').exists())
+        self.assertEqual(
+            self.client.session['register_form_data']['errors']['email'],
+            ['O email já está em uso.'],
+        )
+
+    def test_register_conflict_without_field_error_shows_a_general_error(self):
+        # A colisao some antes da segunda validacao (ex.: o outro cadastro
+        # foi desfeito): nenhum campo acusa erro
+        with patch.object(User, 'save', side_effect=IntegrityError):
+            response = self.client.post(
+                reverse('authors:register_create'), self.form_data,
+                follow=True,
+            )
+
+        self.assertFalse(User.objects.filter(username='maria').exists())
+        self.assertEqual(
+            response.context['form'].non_field_errors(),
+            [REGISTER_CONFLICT_ERROR],
+        )
+        self.assertContains(response, REGISTER_CONFLICT_ERROR)
+        # Os dados enviados voltam preenchidos
+        self.assertEqual(response.context['form']['username'].value(), 'maria')
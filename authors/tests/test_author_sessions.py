@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+
+class AuthorSessionStorageTest(TestCase):
+    def setUp(self) -> None:
+        self.form_data = {
+            'username': 'user',
+            'first_name': 'first',
+            'last_name': 'last',
+            'email': 'email@anyemail.com',
+            'password': 'abc123',
+            'password_confirm': 'abc123',
+        }
+        return super().setUp()
+
+    def test_register_failure_keeps_no_password_in_the_session(self):
+        self.client.post(reverse('authors:register_create'), self.form_data)
+
+        saved = self.client.session['register_form_data']
+        self.assertEqual(saved['data']['username'], 'user')
+        self.assertNotIn('password', saved['data'])
+        self.assertNotIn('password_confirm', saved['data'])
+        self.assertNotIn('abc123', str(saved))
+
+    def test_register_form_shows_only_the_password_errors_it_had(self):
+        self.form_data['first_name'] = 'Luis1'
+        self.form_data['password'] = 'Abc@abc123'
+        self.form_data['password_confirm'] = 'Abc@abc123'
+
+        response = self.client.post(
+            reverse('authors:register_create'), self.form_data, follow=True,
+        )
+
+        form = response.context['form']
+        self.assertIn('first_name', form.errors)
+        self.assertNotIn('password', form.errors)
+        self.assertNotIn('password_confirm', form.errors)
+
+    def test_flash_messages_do_not_write_the_session(self):
+        response = self.client.post(
+            reverse('authors:login_create'),
+            {'username': 'ninguem', 'password': 'errada'},
+            follow=True,
+        )
+
+        self.assertIn('Credenciais inválidas', response.content.decode('utf-8'))
+        self.assertFalse(Session.objects.exists())
+
+    def test_clear_expired_sessions_deletes_only_expired_in_batches(self):
+        for offset in (-2, -1, -1, 1):
+            session = SessionStore()
+            session['value'] = offset
+            session.set_expiry(timezone.now() + timedelta(days=offset))
+            session.save()
+
+        output = StringIO()
+        call_command('clear_expired_sessions', batch_size=2, stdout=output)
+
+        self.assertEqual(Session.objects.count(), 1)
+        self.assertIn('3 sessao(oes)', output.getvalue())
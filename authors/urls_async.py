@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import async_views
+from .urls import app_name, urlpatterns as sync_urlpatterns  # noqa: F401
+
+urlpatterns = [
+    path('login/create/', async_views.login_create, name='login_create'),
+] + [
+    pattern for pattern in sync_urlpatterns if pattern.name != 'login_create'
+]
@@ -1,19 +1,49 @@
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import IntegrityError, transaction
 from django.http import Http404
 from django.shortcuts import redirect, render
 from django.urls import reverse
 
 from authors.forms.recipe_form import AuthorRecipeForm
+from project.ratelimit import Rate, rate_limit
+from recipes.caching import author_recipe_counts
 from recipes.models import Recipe
+from recipes.views import PER_PAGE
+from utils.pagination import make_pagination
 
 from .forms import LoginForm, RegisterForm
 
+# Cada tentativa de login custa um hash PBKDF2
+LOGIN_RATE_PER_IP = Rate(10, 60)
+LOGIN_RATE_PER_USERNAME = Rate(5, 5 * 60)
+
+
+# Senhas nunca vao para a sessao
+REGISTER_SECRET_FIELDS = ('password', 'password_confirm')
+
+REGISTER_CONFLICT_ERROR = (
+    'Não foi possível concluir o cadastro. Tente novamente.'
+)
+
 
 def register_view(request):
-    register_form_data = request.session.get('register_form_data', None)
-    form = RegisterForm(register_form_data)
+    saved = request.session.get('register_form_data', None)
+
+    if saved is None:
+        form = RegisterForm()
+    else:
+        form = RegisterForm(saved['data'])
+        # Sem as senhas o form acusaria campos vazios: mostra os erros que
+        # elas tiveram no envio, assim como os erros gerais do form
+        for field in (*REGISTER_SECRET_FIELDS, NON_FIELD_ERRORS):
+            if field in saved['errors']:
+                form.errors[field] = form.error_class(saved['errors'][field])
+            else:
+                form.errors.pop(field, None)
+
     return render(request, 'authors/pages/register_view.html',{
         'form': form,
         'form_action': reverse('authors:register_create'),
@@ -23,19 +53,40 @@ def register_create(request):
     if not request.POST:
         raise Http404()
     
-    POST = request.POST
-    request.session['register_form_data'] = POST
-    form = RegisterForm(POST)
+    form = RegisterForm(request.POST)
 
     if form.is_valid():
         user = form.save(commit=False)
         user.set_password(user.password)
-        user.save()
-        messages.success(request, 'Seu usuário foi cadastrado.')
-        
-        del(request.session['register_form_data'])
-        return redirect('authors:login')
 
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            # Outro cadastro gravou o mesmo usuario ou email depois da
+            # validacao: validar de novo mostra qual campo colidiu
+            form = RegisterForm(request.POST)
+            if form.is_valid():
+                # Nenhum campo acusou a colisao: o envio nao pode sumir sem
+                # explicacao
+                form.add_error(None, REGISTER_CONFLICT_ERROR)
+        else:
+            messages.success(request, 'Seu usuário foi cadastrado.')
+
+            request.session.pop('register_form_data', None)
+            return redirect('authors:login')
+
+    # So os campos sem segredo e as mensagens de erro, para reexibir o form
+    request.session['register_form_data'] = {
+        'data': {
+            field: request.POST.get(field, '')
+            for field in form.fields
+            if field not in REGISTER_SECRET_FIELDS
+        },
+        'errors': {
+            field: list(errors) for field, errors in form.errors.items()
+        },
+    }
     return redirect('authors:register')
 
 def login_view(request):
@@ -45,6 +96,10 @@ def login_view(request):
         'form_action': reverse('authors:login_create'),
     })
 
+@rate_limit(
+    'login', per_ip=LOGIN_RATE_PER_IP,
+    per_username=LOGIN_RATE_PER_USERNAME,
+)
 def login_create(request):
     if not request.POST:
         raise Http404()
@@ -81,15 +136,22 @@ def logout_view(request):
 
 @login_required(login_url='authors:login', redirect_field_name='next')
 def dashboard(request):
-    recipes = Recipe.objects.filter(
-        is_published=False,
-        author=request.user
+    counts = author_recipe_counts(request.user.id)
+    # O total de rascunhos vem do aggregate em cache: o paginador nao faz COUNT
+    page_object, pagination_range = make_pagination(
+        request,
+        Recipe.objects.drafts_of(request.user).order_by('-id'),
+        PER_PAGE,
+        count=counts['drafts'],
     )
+
     return render(
         request,
         'authors/pages/dashboard.html',
         context={
-            'recipes': recipes,
+            'recipes': page_object,
+            'pagination_range': pagination_range,
+            'counts': counts,
         }
     )
 
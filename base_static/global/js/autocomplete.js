@@ -0,0 +1,39 @@
+// Sugestoes de titulos enquanto o usuario digita na busca do topo
+(function () {
+    const input = document.querySelector('.search-input[data-autocomplete-url]');
+    if (!input) {
+        return;
+    }
+
+    const list = document.getElementById(input.getAttribute('list'));
+    let timer = null;
+    let controller = null;
+
+    input.addEventListener('input', function () {
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+            const term = input.value.trim();
+            if (!term) {
+                list.replaceChildren();
+                return;
+            }
+
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+
+            const url = input.dataset.autocompleteUrl + '?q=' + encodeURIComponent(term);
+            fetch(url, { signal: controller.signal })
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    list.replaceChildren(...data.suggestions.map(function (suggestion) {
+                        const option = document.createElement('option');
+                        option.value = suggestion.title;
+                        return option;
+                    }));
+                })
+                .catch(function () {});
+        }, 150);
+    });
+})();
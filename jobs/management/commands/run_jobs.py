@@ -0,0 +1,50 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from jobs import queue
+
+
+class Command(BaseCommand):
+    help = 'Executa os jobs pendentes em um pool de threads, sem broker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Segundos de espera quando a fila esta vazia',
+        )
+        parser.add_argument(
+            '--lock-timeout', type=int, default=60 * 10,
+            help='Segundos ate um job em execucao ser considerado abandonado',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Esvazia a fila e termina',
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        processed = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                queue.requeue_stale_jobs(options['lock_timeout'])
+                job_ids = queue.due_job_ids(limit=workers * 2)
+
+                if job_ids:
+                    for job in executor.map(queue.run_job_in_thread, job_ids):
+                        if job is not None:
+                            processed += 1
+                            self.stdout.write(str(job))
+                    continue
+
+                if options['once']:
+                    break
+
+                time.sleep(options['poll_interval'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{processed} job(s) executado(s).')
+        )
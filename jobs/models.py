@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Pendente'),
+        (RUNNING, 'Executando'),
+        (DONE, 'Concluido'),
+        (FAILED, 'Falhou'),
+    )
+
+    # Caminho pontilhado da funcao, ex.: recipes.tasks.generate_cover_variants
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'run_after'],
+                name='job_status_run_after_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.task} #{self.pk} ({self.status})'
@@ -0,0 +1,127 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 60 * 60
+
+
+def task_path(func):
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def enqueue(func, *args, max_attempts=5, **kwargs):
+    """
+    Grava o job na mesma transacao de quem chamou: se ela for desfeita o job
+    some junto, e o worker so o enxerga depois do commit. Com JOBS_EAGER o
+    job roda logo apos o commit, no proprio processo.
+    """
+    job = Job.objects.create(
+        task=task_path(func),
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+    )
+
+    if getattr(settings, 'JOBS_EAGER', False):
+        transaction.on_commit(lambda: run_job(job.pk))
+
+    return job
+
+
+def backoff_delay(attempts):
+    """Segundos ate a proxima tentativa: exponencial com jitter"""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.75, 1.25)
+
+
+def claim(job_id):
+    """
+    Marca o job como em execucao com um UPDATE condicional, que funciona
+    como trava mesmo no SQLite (sem SELECT ... FOR UPDATE).
+    """
+    return Job.objects.filter(
+        pk=job_id,
+        status=Job.PENDING,
+    ).update(
+        status=Job.RUNNING,
+        locked_at=timezone.now(),
+        updated_at=timezone.now(),
+    ) == 1
+
+
+def due_job_ids(limit):
+    return list(
+        Job.objects.filter(
+            status=Job.PENDING,
+            run_after__lte=timezone.now(),
+        ).order_by('run_after', 'id').values_list('id', flat=True)[:limit]
+    )
+
+
+def requeue_stale_jobs(lock_timeout):
+    """Devolve para a fila jobs de workers que morreram no meio"""
+    return Job.objects.filter(
+        status=Job.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=lock_timeout),
+    ).update(status=Job.PENDING, locked_at=None)
+
+
+def run_job(job_id):
+    if not claim(job_id):
+        return None
+
+    job = Job.objects.get(pk=job_id)
+    job.attempts += 1
+
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+
+        if job.attempts < job.max_attempts:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=backoff_delay(job.attempts)
+            )
+            logger.warning(
+                'Job %s falhou, nova tentativa em %s', job, job.run_after
+            )
+        else:
+            job.status = Job.FAILED
+            logger.error('Job %s falhou definitivamente', job)
+    else:
+        job.status = Job.DONE
+        job.last_error = ''
+
+    job.locked_at = None
+    job.save(update_fields=[
+        'attempts', 'status', 'run_after', 'locked_at', 'last_error',
+        'updated_at',
+    ])
+    return job
+
+
+def run_due_jobs(limit=100):
+    """Executa os jobs vencidos na thread atual (util em testes e scripts)"""
+    return [
+        job for job in map(run_job, due_job_ids(limit)) if job is not None
+    ]
+
+
+def run_job_in_thread(job_id):
+    # Cada thread tem sua conexao; fechamos ao terminar para nao vazar
+    try:
+        return run_job(job_id)
+    finally:
+        close_old_connections()
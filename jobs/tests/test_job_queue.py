@@ -0,0 +1,108 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+
+CALLS = []
+
+
+def record_call(*args, **kwargs):
+    CALLS.append((args, kwargs))
+
+
+def always_fail():
+    raise RuntimeError('falhou')
+
+
+class JobQueueTest(TestCase):
+    def setUp(self) -> None:
+        CALLS.clear()
+        return super().setUp()
+
+    def test_enqueue_stores_task_path_and_arguments(self):
+        job = queue.enqueue(record_call, 1, 'a', flag=True)
+
+        self.assertEqual(job.task, 'jobs.tests.test_job_queue.record_call')
+        self.assertEqual(job.args, [1, 'a'])
+        self.assertEqual(job.kwargs, {'flag': True})
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(CALLS, [])
+
+    def test_run_job_executes_task_and_marks_it_done(self):
+        job = queue.enqueue(record_call, 42)
+        job = queue.run_job(job.pk)
+
+        self.assertEqual(CALLS, [((42,), {})])
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.attempts, 1)
+
+    def test_failed_job_is_retried_later_with_backoff(self):
+        job = queue.enqueue(always_fail)
+        job = queue.run_job(job.pk)
+
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('RuntimeError: falhou', job.last_error)
+        self.assertEqual(queue.due_job_ids(limit=10), [])
+
+    def test_job_fails_for_good_after_max_attempts(self):
+        job = queue.enqueue(always_fail, max_attempts=2)
+        queue.run_job(job.pk)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+        job = queue.run_job(job.pk)
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_backoff_grows_exponentially(self):
+        self.assertLess(queue.backoff_delay(1), queue.backoff_delay(4))
+        self.assertLessEqual(
+            queue.backoff_delay(50), queue.BACKOFF_MAX_SECONDS * 1.25
+        )
+
+    def test_job_can_only_be_claimed_once(self):
+        job = queue.enqueue(record_call)
+
+        self.assertTrue(queue.claim(job.pk))
+        self.assertFalse(queue.claim(job.pk))
+        self.assertIsNone(queue.run_job(job.pk))
+
+    def test_stale_running_jobs_go_back_to_the_queue(self):
+        job = queue.enqueue(record_call)
+        queue.claim(job.pk)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(queue.requeue_stale_jobs(lock_timeout=60), 1)
+        self.assertEqual(queue.due_job_ids(limit=10), [job.pk])
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_jobs_run_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            queue.enqueue(record_call, 'agora')
+            self.assertEqual(CALLS, [])
+
+        self.assertEqual(CALLS, [(('agora',), {})])
+
+
+class RunJobsCommandTest(TransactionTestCase):
+    def setUp(self) -> None:
+        CALLS.clear()
+        return super().setUp()
+
+    def test_run_jobs_once_drains_the_queue_with_a_thread_pool(self):
+        for i in range(5):
+            queue.enqueue(record_call, i)
+
+        stdout = StringIO()
+        call_command('run_jobs', '--once', '--workers', '2', stdout=stdout)
+
+        self.assertEqual(sorted(args[0] for args, _ in CALLS), list(range(5)))
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 5)
+        self.assertIn('5 job(s) executado(s).', stdout.getvalue())
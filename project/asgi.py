@@ -15,4 +15,10 @@ from dotenv import load_dotenv
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 load_dotenv()
+os.environ.setdefault('ASYNC_VIEWS', '1')
 application = get_asgi_application()
+
+from project import warmup  # noqa: E402 - precisa do Django configurado
+
+if warmup.is_enabled():
+    warmup.warm_up()
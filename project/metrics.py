@@ -0,0 +1,180 @@
+"""
+Metricas por requisicao: numero de queries, tempo de banco, queries
+repetidas (assinatura tipica de N+1) e tempo de renderizacao de templates.
+Saem no header Server-Timing e, com REQUEST_METRICS_LOG=1, em uma linha de
+log JSON.
+
+O wrapper de execucao e instalado em toda conexao aberta e le as metricas
+da requisicao atual de uma ContextVar; fora de uma requisicao ele so repassa
+a chamada. A ContextVar acompanha o sync_to_async, entao as queries das
+views async tambem sao contadas.
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+logger = logging.getLogger(__name__)
+
+current_metrics = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    @property
+    def duplicate_queries(self):
+        return sum(count - 1 for count in self.statements.values())
+
+    def top_duplicates(self, limit=3):
+        return [
+            {'sql': sql[:200], 'count': count}
+            for sql, count in self.statements.most_common(limit)
+            if count > 1
+        ]
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """
+        >>> metrics = RequestMetrics()
+        >>> metrics.queries, metrics.db_time = 2, 0.0015
+        >>> metrics.server_timing().split(', ')[1:]
+        ['db;dur=1.5;desc="2 queries"', 'dup;desc="0 duplicadas"', 'tpl;dur=0.0']
+        """
+        return ', '.join([
+            f'total;dur={self.elapsed() * 1000:.1f}',
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'dup;desc="{self.duplicate_queries} duplicadas"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+        ])
+
+    def as_log_record(self, request, response):
+        match = request.resolver_match
+        return {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(self.elapsed() * 1000, 2),
+            'db_ms': round(self.db_time * 1000, 2),
+            'queries': self.queries,
+            'duplicate_queries': self.duplicate_queries,
+            'top_duplicates': self.top_duplicates(),
+            'template_ms': round(self.template_time * 1000, 2),
+        }
+
+
+def _measure_query(execute, sql, params, many, context):
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+        # SQL ainda com os placeholders: a mesma query com outros
+        # parametros tem a mesma assinatura
+        metrics.statements[sql] += 1
+
+
+def install_query_wrapper(connection, **kwargs):
+    if _measure_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_measure_query)
+
+
+connection_created.connect(install_query_wrapper)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+
+        # Templates renderizados dentro de outro (render_to_string dos
+        # cards) ja estao dentro do tempo do template de fora
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Backend DjangoTemplates que mede o tempo de renderizacao"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+        # Conexoes abertas antes do middleware ser carregado
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_response(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_response(request, response, metrics)
+
+    def process_response(self, request, response, metrics):
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing()
+        if settings.REQUEST_METRICS_LOG:
+            logger.info(
+                'request_metrics %s',
+                json.dumps(metrics.as_log_record(request, response)),
+            )
+        return response
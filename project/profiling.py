@@ -0,0 +1,148 @@
+"""
+Profiling por requisicao com cProfile. Um usuario staff liga para uma
+requisicao com ?_profile=1; com PROFILE_SAMPLE_RATE=N, 1 a cada N
+requisicoes tambem e profilada. Os arquivos .prof vao para PROFILE_DIR, que
+guarda no maximo PROFILE_MAX_FILES arquivos (os mais antigos saem).
+
+O nome do arquivo leva a rota, o numero de queries e o tempo total:
+
+    20261018T142501-recipes.search-12q-245ms-3f9a1c.prof
+
+Para ler: python -m pstats <arquivo> ou snakeviz <arquivo>.
+"""
+import cProfile
+import logging
+import random
+import time
+import uuid
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from project.metrics import current_metrics
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_PARAMETER = '_profile'
+
+
+def is_staff_trigger(request):
+    user = getattr(request, 'user', None)
+    return (
+        request.GET.get(TRIGGER_PARAMETER) == '1'
+        and user is not None
+        and user.is_staff
+    )
+
+
+def should_profile(request):
+    if is_staff_trigger(request):
+        return True
+
+    rate = settings.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.randrange(rate) == 0
+
+
+def dump_name(request, elapsed):
+    """
+    >>> from types import SimpleNamespace
+    >>> request = SimpleNamespace(
+    ...     resolver_match=SimpleNamespace(view_name='recipes:search'))
+    >>> dump_name(request, 0.2454).split('-')[1:4]
+    ['recipes.search', '0q', '245ms']
+    """
+    match = getattr(request, 'resolver_match', None)
+    view_name = match.view_name.replace(':', '.') if match else 'unresolved'
+    metrics = current_metrics.get()
+    queries = metrics.queries if metrics else 0
+
+    return '-'.join([
+        time.strftime('%Y%m%dT%H%M%S'),
+        view_name,
+        f'{queries}q',
+        f'{round(elapsed * 1000)}ms',
+        uuid.uuid4().hex[:6],
+    ]) + '.prof'
+
+
+def rotate(directory, max_files):
+    dumps = sorted(
+        directory.glob('*.prof'), key=lambda path: path.stat().st_mtime,
+    )
+    for path in dumps[:max(0, len(dumps) - max_files)]:
+        path.unlink(missing_ok=True)
+
+
+def save_profile(profiler, request, elapsed):
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / dump_name(request, elapsed)
+    profiler.dump_stats(path)
+    rotate(directory, settings.PROFILE_MAX_FILES)
+    logger.info('profile salvo em %s', path)
+    return path
+
+
+class ProfilingMiddleware:
+    """
+    Depois do AuthenticationMiddleware (usa request.user). So um cProfile
+    pode ficar ativo por vez no processo: se outra requisicao ja esta sendo
+    profilada, esta segue sem profiling.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not should_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        if not self.enable(profiler):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        return self.finish(profiler, request, response, start)
+
+    async def __acall__(self, request):
+        if not should_profile(request):
+            return await self.get_response(request)
+
+        # No async o profiler ve a thread do event loop; as queries rodam
+        # na thread do sync_to_async e aparecem como espera
+        profiler = cProfile.Profile()
+        if not self.enable(profiler):
+            return await self.get_response(request)
+
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+        return self.finish(profiler, request, response, start)
+
+    def enable(self, profiler):
+        try:
+            profiler.enable()
+        except ValueError:
+            return False
+        return True
+
+    def finish(self, profiler, request, response, start):
+        path = save_profile(profiler, request, time.perf_counter() - start)
+        if is_staff_trigger(request):
+            response['X-Profile-File'] = path.name
+        return response
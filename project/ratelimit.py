@@ -0,0 +1,173 @@
+"""
+Rate limit por token bucket para as views caras (busca e login). Cada
+chave (IP ou usuario) tem um balde com `capacity` fichas que se recarrega a
+capacity / period fichas por segundo; cada requisicao gasta uma. Sem ficha,
+a view nem roda: a resposta e um 429 com Retry-After.
+
+O estado dos baldes fica em um store escolhido por RATE_LIMIT_STORE:
+
+- memory: dict do processo com despejo LRU (RATE_LIMIT_MAX_KEYS chaves);
+  atomico, mas cada worker conta separado.
+- cache: o cache padrao do Django, compartilhado entre os workers quando o
+  backend e compartilhado. Leitura e escrita nao sao atomicas: sob corrida
+  um cliente pode passar algumas requisicoes alem do limite.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+
+Rate = namedtuple('Rate', 'capacity period')
+
+
+def refill(state, rate, now):
+    """
+    Fichas do balde agora e a espera ate a proxima, depois de gastar uma
+
+    >>> refill(None, Rate(2, 10), now=0.0)
+    ((1.0, 0.0), 0)
+    >>> refill((0.0, 0.0), Rate(2, 10), now=1.0)
+    ((0.2, 1.0), 4)
+    """
+    per_second = rate.capacity / rate.period
+    tokens, updated = state if state is not None else (rate.capacity, now)
+    tokens = min(float(rate.capacity), tokens + (now - updated) * per_second)
+
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+
+    return (tokens, now), math.ceil((1 - tokens) / per_second)
+
+
+class MemoryStore:
+    is_local = True
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, rate, now):
+        with self.lock:
+            state, retry_after = refill(self.buckets.get(key), rate, now)
+            self.buckets[key] = state
+            self.buckets.move_to_end(key)
+
+            # Um balde despejado volta cheio, o que so favorece o cliente
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+
+        return retry_after
+
+
+class CacheStore:
+    is_local = False
+
+    def take(self, key, rate, now):
+        cache_key = 'ratelimit:' + hashlib.md5(
+            repr(key).encode('utf-8')
+        ).hexdigest()
+        state, retry_after = refill(cache.get(cache_key), rate, now)
+        # Depois de um periodo sem uso o balde estaria cheio de qualquer jeito
+        cache.set(cache_key, state, math.ceil(rate.period) + 1)
+        return retry_after
+
+
+_store = None
+
+
+def get_store():
+    global _store
+
+    if _store is None:
+        if settings.RATE_LIMIT_STORE == 'cache':
+            _store = CacheStore()
+        else:
+            _store = MemoryStore(settings.RATE_LIMIT_MAX_KEYS)
+    return _store
+
+
+def reset_store():
+    global _store
+    _store = None
+
+
+def client_ip(request):
+    # Atras de um proxy, REMOTE_ADDR precisa ser corrigido antes (no proxy
+    # ou em um middleware); X-Forwarded-For nao e confiavel aqui
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def login_username(request):
+    return request.POST.get('username', '').strip().lower()[:150] or None
+
+
+def retry_after(request, scope, per_ip, per_username):
+    """Maior espera entre os baldes esgotados, ou 0 se a requisicao passa"""
+    store = get_store()
+    now = time.monotonic() if store.is_local else time.time()
+    buckets = [(per_ip, ('ip', client_ip(request)))]
+
+    if per_username is not None:
+        username = login_username(request)
+        if username is not None:
+            buckets.append((per_username, ('username', username)))
+
+    # Todos os baldes gastam a ficha, mesmo quando um deles ja esgotou
+    return max(
+        store.take((scope, *key), rate, now) for rate, key in buckets
+    )
+
+
+def too_many_requests(wait):
+    response = HttpResponse(
+        'Muitas requisições. Tente novamente em instantes.',
+        status=429,
+        content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(wait)
+    patch_cache_control(response, no_store=True)
+    return response
+
+
+def rate_limit(scope, per_ip, per_username=None):
+    """
+    Limita a view por IP e, com per_username, tambem pelo campo username do
+    POST. Fica por fora dos decorators de cache, para o 429 sair antes de
+    qualquer consulta.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_wrapped_view(request, *args, **kwargs):
+                if settings.RATE_LIMIT_ENABLED:
+                    if get_store().is_local:
+                        wait = retry_after(request, scope, per_ip, per_username)
+                    else:
+                        wait = await sync_to_async(retry_after)(
+                            request, scope, per_ip, per_username,
+                        )
+                    if wait:
+                        return too_many_requests(wait)
+
+                return await view_func(request, *args, **kwargs)
+            return _async_wrapped_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if settings.RATE_LIMIT_ENABLED:
+                wait = retry_after(request, scope, per_ip, per_username)
+                if wait:
+                    return too_many_requests(wait)
+
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 from django.contrib.messages import constants
@@ -43,23 +44,31 @@ INSTALLED_APPS = [
     # Apps do produto
     'recipes',
     'authors',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    'project.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'project.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'project.urls'
+# asgi.py turns ASYNC_VIEWS on, switching to the native async views
+ASYNC_VIEWS = True if os.environ.get('ASYNC_VIEWS') == '1' else False
+
+ROOT_URLCONF = 'project.urls_async' if ASYNC_VIEWS else 'project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that also times rendering for Server-Timing
+        'BACKEND': 'project.metrics.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [
             BASE_DIR / 'base_templates',
         ],
@@ -89,6 +98,56 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+LOCMEM_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', LOCMEM_CACHE),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'receitas'),
+    }
+}
+
+# Page versions (recipes.caching) invalidate cached pages, validators, search
+# results and the category nav. They must be seen by every process: web
+# workers, `run_jobs` and management commands. locmem is per process, so in
+# that case the versions live in a small file cache shared by all processes
+# on the host; with a shared default cache they simply use it.
+if CACHES['default']['BACKEND'] == LOCMEM_CACHE:
+    CACHES['versions'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'VERSION_CACHE_LOCATION',
+            Path(tempfile.gettempdir()) / 'receitas-versions',
+        ),
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    }
+else:
+    CACHES['versions'] = CACHES['default']
+
+
+# Sessions and messages
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/
+
+# cached_db reads sessions from the cache and only falls back to the
+# database on a miss. It needs a cache shared by every worker: with the
+# per-process locmem cache a worker could keep serving a session that was
+# already logged out elsewhere, so that setup stays on the database engine.
+SESSION_ENGINE = os.environ.get(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.db'
+    if CACHES['default']['BACKEND'] == LOCMEM_CACHE
+    else 'django.contrib.sessions.backends.cached_db',
+)
+
+# Flash messages travel in a signed cookie instead of writing the session
+MESSAGE_STORAGE = os.environ.get(
+    'MESSAGE_STORAGE', 'django.contrib.messages.storage.cookie.CookieStorage',
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -137,6 +196,48 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'project': {
+            'handlers': ['console'],
+            'level': os.environ.get('PROJECT_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
+# Per-request metrics (project.metrics): Server-Timing header, on unless
+# SERVER_TIMING=0, and an optional JSON log line per request
+SERVER_TIMING = False if os.environ.get('SERVER_TIMING') == '0' else True
+REQUEST_METRICS_LOG = (
+    True if os.environ.get('REQUEST_METRICS_LOG') == '1' else False
+)
+
+# cProfile dumps (project.profiling): staff trigger one with ?_profile=1;
+# PROFILE_SAMPLE_RATE=N also profiles 1 in N requests (0 = off). The dumps
+# go to the temp dir by default, outside the repository
+PROFILE_SAMPLE_RATE = int(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = os.environ.get(
+    'PROFILE_DIR', Path(tempfile.gettempdir()) / 'receitas-profiles',
+)
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 100))
+
+# Token buckets in front of search and login (project.ratelimit). The store
+# is `memory` (per-process LRU dict) or `cache` (the default cache)
+RATE_LIMIT_ENABLED = False if os.environ.get('RATE_LIMIT_ENABLED') == '0' else True
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE', 'memory')
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 10000))
+
+# Background jobs (jobs app). 1 = run each job right after the commit,
+# inside the request process, instead of waiting for `manage.py run_jobs`
+JOBS_EAGER = True if os.environ.get('JOBS_EAGER') == '1' else False
+
 MESSAGE_TAGS = {
     constants.DEBUG: 'message-debug',
     constants.ERROR: 'message-error',
@@ -0,0 +1,68 @@
+import json
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import reverse
+
+from project import metrics
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class RequestMetricsTest(RecipeTestBase):
+    def test_server_timing_header_counts_queries(self):
+        recipe = self.make_recipe()
+
+        response = self.client.get(
+            reverse('recipes:recipe', kwargs={'id': recipe.id})
+        )
+        timing = response['Server-Timing']
+
+        self.assertIn('total;dur=', timing)
+        self.assertIn('tpl;dur=', timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_duplicate_queries_are_counted(self):
+        recipe = self.make_recipe()
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current_metrics.set(request_metrics)
+        try:
+            for _ in range(3):
+                type(recipe).objects.get(pk=recipe.pk)
+        finally:
+            metrics.current_metrics.reset(token)
+
+        self.assertEqual(request_metrics.queries, 3)
+        self.assertEqual(request_metrics.duplicate_queries, 2)
+        self.assertEqual(request_metrics.top_duplicates()[0]['count'], 3)
+
+    def test_queries_outside_requests_are_not_counted(self):
+        self.make_recipe()
+        self.assertIsNone(metrics.current_metrics.get())
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_header_can_be_disabled(self):
+        response = self.client.get(reverse('recipes:home'))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_METRICS_LOG=True)
+    def test_metrics_log_line_is_json(self):
+        self.make_recipe()
+
+        with patch.object(metrics.logger, 'info') as info:
+            self.client.get(reverse('recipes:home'))
+
+        record = json.loads(info.call_args.args[1])
+        self.assertEqual(record['view'], 'recipes:home')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+
+    @override_settings(ROOT_URLCONF='project.urls_async')
+    async def test_async_views_queries_are_counted(self):
+        await sync_to_async(self.make_recipe)()
+
+        response = await self.async_client.get(reverse('recipes:home'))
+
+        self.assertRegex(
+            response['Server-Timing'], r'desc="[1-9]\d* queries"',
+        )
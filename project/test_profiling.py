@@ -0,0 +1,61 @@
+import pstats
+import tempfile
+from pathlib import Path
+
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class ProfilingMiddlewareTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.profile_dir = tempfile.TemporaryDirectory()
+        settings = override_settings(PROFILE_DIR=self.profile_dir.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(self.profile_dir.cleanup)
+
+    def dumps(self):
+        return sorted(Path(self.profile_dir.name).glob('*.prof'))
+
+    def login_staff(self):
+        author = self.make_author(username='staff')
+        author.is_staff = True
+        author.save()
+        self.client.force_login(author)
+
+    def test_staff_trigger_writes_tagged_profile(self):
+        self.login_staff()
+
+        response = self.client.get(
+            reverse('recipes:search') + '?q=bolo&_profile=1'
+        )
+
+        [dump] = self.dumps()
+        self.assertEqual(response['X-Profile-File'], dump.name)
+        self.assertIn('-recipes.search-', dump.name)
+        self.assertRegex(dump.name, r'-\d+q-\d+ms-')
+        self.assertTrue(pstats.Stats(str(dump)).total_calls)
+
+    def test_trigger_is_ignored_for_non_staff(self):
+        response = self.client.get(reverse('recipes:home') + '?_profile=1')
+
+        self.assertNotIn('X-Profile-File', response)
+        self.assertEqual(self.dumps(), [])
+
+    @override_settings(PROFILE_SAMPLE_RATE=1)
+    def test_sampling_profiles_without_exposing_the_file(self):
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertNotIn('X-Profile-File', response)
+        self.assertEqual(len(self.dumps()), 1)
+
+    @override_settings(PROFILE_SAMPLE_RATE=1, PROFILE_MAX_FILES=2)
+    def test_old_dumps_are_rotated(self):
+        for page in range(4):
+            self.client.get(reverse('recipes:home') + f'?page={page}')
+
+        self.assertEqual(len(self.dumps()), 2)
+
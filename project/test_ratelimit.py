@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from project import ratelimit
+from project.ratelimit import MemoryStore, Rate
+from recipes import views
+
+
+class RateLimitTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        ratelimit.reset_store()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        ratelimit.reset_store()
+        return super().tearDown()
+
+    def search(self, ip='10.0.0.1'):
+        return self.client.get(
+            reverse('recipes:search') + '?q=bolo', REMOTE_ADDR=ip,
+        )
+
+    def login(self, username, ip='10.0.0.1'):
+        return self.client.post(
+            reverse('authors:login_create'),
+            {'username': username, 'password': 'errada'},
+            REMOTE_ADDR=ip,
+        )
+
+    def test_search_gets_429_with_retry_after_once_the_bucket_is_empty(self):
+        for _ in range(views.SEARCH_RATE.capacity):
+            self.assertEqual(self.search().status_code, 200)
+
+        response = self.search()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response['Retry-After']), (1, 2))
+        self.assertIn('no-store', response['Cache-Control'])
+
+        # Outro IP tem o proprio balde
+        self.assertEqual(self.search(ip='10.0.0.2').status_code, 200)
+
+    def test_over_limit_login_does_not_hash_the_password(self):
+        User.objects.create_user(username='maria', password='Senha123')
+
+        for index in range(5):
+            self.login('maria', ip=f'10.0.1.{index}')
+
+        with self.assertNumQueries(0):
+            response = self.login(' MARIA ', ip='10.0.2.1')
+
+        self.assertEqual(response.status_code, 429)
+        # Uma ficha a cada 60s no balde do usuario
+        self.assertIn(int(response['Retry-After']), range(55, 61))
+
+    @override_settings(RATE_LIMIT_STORE='cache')
+    def test_cache_store_shares_buckets(self):
+        ratelimit.reset_store()
+        self.assertIsInstance(ratelimit.get_store(), ratelimit.CacheStore)
+
+        for index in range(10):
+            self.login(f'user{index}')
+
+        self.assertEqual(self.login('outro').status_code, 429)
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled_limit_lets_everything_through(self):
+        for _ in range(12):
+            self.assertEqual(self.login('maria').status_code, 302)
+
+    def test_memory_store_evicts_the_least_recently_used_key(self):
+        store = MemoryStore(max_keys=2)
+        rate = Rate(1, 60)
+
+        store.take('a', rate, now=0.0)
+        store.take('b', rate, now=0.0)
+        store.take('a', rate, now=0.0)
+        store.take('c', rate, now=0.0)
+
+        self.assertEqual(list(store.buckets), ['a', 'c'])
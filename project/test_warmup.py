@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from project import warmup
+from recipes import prefix_index
+
+
+class WarmupTest(TestCase):
+    def test_template_names_include_base_and_app_templates(self):
+        names = set(warmup.template_names())
+
+        self.assertIn('global/base.html', names)
+        self.assertIn('recipes/pages/home.html', names)
+        self.assertIn('authors/pages/login.html', names)
+
+    def test_named_url_patterns_are_namespaced(self):
+        names = dict(warmup.named_url_patterns())
+
+        self.assertIn('recipes:home', names)
+        self.assertIn('category_id', names['recipes:category'])
+
+    def test_warm_up_times_every_step(self):
+        self.addCleanup(prefix_index.reset_index)
+        with self.assertLogs('project.warmup', level='INFO') as logs:
+            timings = warmup.warm_up()
+
+        self.assertEqual(
+            ['templates', 'urls', 'databases', 'autocomplete'], list(timings),
+        )
+        self.assertTrue(any('warmup concluido' in line for line in logs.output))
+
+    def test_warm_up_is_opt_in(self):
+        with patch.dict('os.environ', {'WARMUP': '0'}):
+            self.assertFalse(warmup.is_enabled())
+        with patch.dict('os.environ', {'WARMUP': '1'}):
+            self.assertTrue(warmup.is_enabled())
@@ -0,0 +1,17 @@
+"""
+URLs usadas sob ASGI (ASYNC_VIEWS=1): mesmas rotas de project.urls, com as
+views publicas de receitas e o login em versao async.
+"""
+from django.conf import settings
+from django.conf.urls.static import static
+from django.contrib import admin
+from django.urls import include, path
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', include('recipes.urls_async')),
+    path('authors/', include('authors.urls_async')),
+]
+
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -0,0 +1,133 @@
+"""
+Aquecimento opcional do worker (WARMUP=1), chamado por wsgi.py e asgi.py
+antes da primeira requisicao.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import (TemplateDoesNotExist, TemplateSyntaxError,
+                             engines)
+from django.template.utils import get_app_template_dirs
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from django.urls.converters import IntConverter
+
+logger = logging.getLogger(__name__)
+
+
+def is_enabled():
+    return os.environ.get('WARMUP') == '1'
+
+
+@contextmanager
+def _timed(step, timings):
+    start = time.perf_counter()
+    yield
+    timings[step] = time.perf_counter() - start
+    logger.info('warmup %s: %.1f ms', step, timings[step] * 1000)
+
+
+def template_names():
+    dirs = []
+    for engine in settings.TEMPLATES:
+        dirs += [Path(directory) for directory in engine.get('DIRS', [])]
+    dirs += [Path(directory) for directory in get_app_template_dirs('templates')]
+
+    for directory in dirs:
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def compile_templates():
+    # Com o loader em cache, get_template compila e guarda cada template
+    engine = engines['django']
+    names = set(template_names())
+
+    compiled = 0
+
+    for name in names:
+        try:
+            engine.get_template(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+            logger.warning('warmup: template %s ignorado: %s', name, error)
+            continue
+        compiled += 1
+
+    return compiled
+
+
+def _sample_value(converter):
+    return 1 if isinstance(converter, IntConverter) else 'a'
+
+
+def named_url_patterns(resolver=None, namespace=None):
+    resolver = resolver or get_resolver()
+
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or namespace
+            if namespace and pattern.namespace:
+                child_namespace = f'{namespace}:{pattern.namespace}'
+            yield from named_url_patterns(pattern, child_namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+            yield name, getattr(pattern.pattern, 'converters', {})
+
+
+def warm_urls():
+    count = 0
+
+    for name, converters in named_url_patterns():
+        kwargs = {
+            key: _sample_value(converter)
+            for key, converter in converters.items()
+        }
+        try:
+            resolve(reverse(name, kwargs=kwargs))
+        except Exception:  # noqa: BLE001 - rotas do admin com regex, etc.
+            logger.debug('warmup: nao foi possivel aquecer %s', name)
+            continue
+        count += 1
+
+    return count
+
+
+def prime_databases():
+    # Conexoes do Django sao por thread: isto prepara a da thread principal
+    # e o cache de paginas do arquivo SQLite para o processo
+    for alias in connections:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    return len(connections.all())
+
+
+def build_autocomplete_index():
+    # Montado aqui o indice nao pesa na primeira requisicao de autocomplete
+    from recipes import prefix_index
+
+    return len(prefix_index.get_index().titles)
+
+
+def warm_up():
+    timings = {}
+
+    with _timed('templates', timings):
+        templates = compile_templates()
+    with _timed('urls', timings):
+        urls = warm_urls()
+    with _timed('databases', timings):
+        databases = prime_databases()
+    with _timed('autocomplete', timings):
+        titles = build_autocomplete_index()
+
+    logger.info(
+        'warmup concluido em %.1f ms (%d templates, %d urls, %d bancos, '
+        '%d titulos)',
+        sum(timings.values()) * 1000, templates, urls, databases, titles,
+    )
+    return timings
@@ -16,3 +16,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 load_dotenv()
 application = get_wsgi_application()
+
+from project import warmup  # noqa: E402 - precisa do Django configurado
+
+if warmup.is_enabled():
+    warmup.warm_up()
@@ -0,0 +1,116 @@
+from asgiref.sync import sync_to_async
+from django.http.response import Http404
+from django.shortcuts import render
+
+from project.ratelimit import rate_limit
+from utils.pagination import amake_pagination, make_pagination
+
+from . import search_cache, views
+from .caching import (GLOBAL_SCOPE, PUBLISHED_COUNT_KEY, RELATED_SCOPE,
+                      published_category, versioned_page_cache)
+from .http_cache import (DETAIL_MAX_AGE, LISTING_MAX_AGE, cache_policy,
+                         category_validators, conditional_view,
+                         home_validators, recipe_validators)
+from .models import Recipe
+
+
+async def _render(request, template_name, context):
+    # O template le usuario, sessao e mensagens, a navegacao de categorias
+    # e o cache dos cards, e qualquer um deles pode ir ao banco (uma versao
+    # alterada no meio da requisicao, por exemplo): renderiza numa thread
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@cache_policy(LISTING_MAX_AGE)
+@conditional_view(home_validators)
+@versioned_page_cache(GLOBAL_SCOPE)
+async def home(request):
+    recipes = Recipe.objects.published_cards().order_by('-id')
+
+    page_object, pagination_range = await amake_pagination(
+        request,
+        recipes,
+        views.PER_PAGE,
+        cursor_ordering=['-id'],
+        count_cache_key=PUBLISHED_COUNT_KEY,
+    )
+
+    return await _render(request, 'recipes/pages/home.html', {
+        'recipes': page_object,
+        'pagination_range': pagination_range,
+    })
+
+
+@cache_policy(LISTING_MAX_AGE)
+@conditional_view(category_validators)
+@versioned_page_cache('category:{category_id}', RELATED_SCOPE)
+async def category(request, category_id):
+    category = await sync_to_async(published_category)(category_id)
+
+    if category is None:
+        raise Http404()
+
+    recipes = Recipe.objects.published_cards().filter(
+        category__id=category_id,
+    ).order_by('-id')
+
+    page_object, pagination_range = await amake_pagination(
+        request,
+        recipes,
+        views.PER_PAGE,
+        cursor_ordering=['-id'],
+        count=category['published_count'],
+    )
+
+    if not page_object:
+        raise Http404()
+
+    return await _render(request, 'recipes/pages/category.html', {
+        'recipes': page_object,
+        'title': f'{category["name"]} - Categoria |',
+        'pagination_range': pagination_range,
+    })
+
+
+@cache_policy(DETAIL_MAX_AGE)
+@conditional_view(recipe_validators)
+@versioned_page_cache('recipe:{id}', RELATED_SCOPE)
+async def recipe(request, id):
+    try:
+        recipe = await Recipe.objects.published().select_related(
+            'author', 'category',
+        ).aget(pk=id)
+    except Recipe.DoesNotExist:
+        raise Http404()
+
+    return await _render(request, 'recipes/pages/recipe-view.html', {
+        'recipe': recipe,
+        'is_detail_page': True,
+        'title': f'{recipe.title} |'
+    })
+
+
+@rate_limit('search', per_ip=views.SEARCH_RATE)
+@cache_policy(LISTING_MAX_AGE)
+@versioned_page_cache(GLOBAL_SCOPE)
+async def search(request):
+    search_term = request.GET.get('q', '').strip()
+
+    if not search_term:
+        raise Http404()
+
+    # IDs em cache por termo normalizado; a pagina e uma fatia da lista
+    page_object, pagination_range = make_pagination(
+        request,
+        await search_cache.aresult_ids(search_term),
+        views.PER_PAGE,
+    )
+    await search_cache.ahydrate(page_object)
+
+    return await _render(request, 'recipes/pages/search.html', {
+        'page_title': f'Pesquisa por "{search_term}" |',
+        'search_term': search_term,
+        'recipes': page_object,
+        'pagination_range': pagination_range,
+        'additional_url_query': f'&q={search_term}',
+    })
@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.core.cache import cache, caches
+from django.db.models import Count, Q
+
+from utils.pagination import COUNT_CACHE_TIMEOUT
+
+from .models import Category, Recipe
+
+PUBLISHED_COUNT_KEY = 'recipes:count:published'
+
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 60 * 10))
+
+GLOBAL_SCOPE = 'global'
+# Categorias e autores, exibidos nas paginas de categoria e de detalhe
+RELATED_SCOPE = 'related'
+
+
+def adjust_count(key, delta):
+    """
+    Soma delta a um contador que ja esta no cache. Se a chave nao existe
+    (ou expirou) nao faz nada: o proximo paginador recalcula o COUNT.
+    """
+    if not delta:
+        return
+
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass
+
+
+def adjust_recipe_counts(previous_state, current_state):
+    """
+    Cada estado e uma tupla (is_published, category_id) ou None quando a
+    receita nao existe (antes da criacao ou depois da remocao). As contagens
+    por categoria ficam em Category.published_count.
+    """
+    was_published, _ = previous_state or (False, None)
+    is_published, _ = current_state or (False, None)
+
+    adjust_count(PUBLISHED_COUNT_KEY, int(is_published) - int(was_published))
+
+
+def author_count_key(author_id):
+    return f'recipes:count:author:{author_id}'
+
+
+def author_recipe_counts(author_id):
+    """
+    Rascunhos e publicadas do autor em um unico aggregate, no cache ate o
+    proximo save ou delete de uma receita dele (recipes.signals).
+    """
+    return cache.get_or_set(
+        author_count_key(author_id),
+        lambda: Recipe.objects.filter(author_id=author_id).aggregate(
+            drafts=Count('id', filter=Q(is_published=False)),
+            published=Count('id', filter=Q(is_published=True)),
+        ),
+        COUNT_CACHE_TIMEOUT,
+    )
+
+
+def published_count_deltas(previous_state, current_state):
+    """
+    Variacao de Category.published_count causada pela mudanca de estado.
+
+    >>> published_count_deltas((True, 1), (True, 2))
+    {1: -1, 2: 1}
+    >>> published_count_deltas((False, 1), (False, 2))
+    {}
+    """
+    deltas = {}
+
+    for state, delta in ((previous_state, -1), (current_state, 1)):
+        is_published, category_id = state or (False, None)
+        if is_published and category_id is not None:
+            deltas[category_id] = deltas.get(category_id, 0) + delta
+
+    return {
+        category_id: delta for category_id, delta in deltas.items() if delta
+    }
+
+
+def version_key(scope):
+    return f'recipes:version:{scope}'
+
+
+def _version_cache():
+    # Alias compartilhado entre os processos (ver CACHES em settings); as
+    # paginas podem ficar no cache local porque as chaves levam as versoes
+    return caches['versions']
+
+
+def _new_version():
+    # Baseado no relogio para nao repetir uma versao antiga se a chave
+    # for removida do cache e recriada depois
+    return time.time_ns()
+
+
+def versions_changed_at(versions):
+    """
+    Cada versao e o instante (ns) da ultima mudanca do escopo; a maior delas
+    diz quando a pagina mudou por ultimo.
+
+    >>> versions_changed_at([1_700_000_000_500_000_000, 0]).isoformat()
+    '2023-11-14T22:13:20.500000+00:00'
+    """
+    return datetime.fromtimestamp(max(versions) / 1e9, tz=timezone.utc)
+
+
+def get_versions(scopes):
+    version_cache = _version_cache()
+    keys = [version_key(scope) for scope in scopes]
+    versions = version_cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            version_cache.add(key, _new_version(), None)
+            versions[key] = version_cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_versions(scopes):
+    version_cache = _version_cache()
+
+    # A nova versao e o instante do bump (ou +1, se o relogio nao andou):
+    # assim ela tambem serve de Last-Modified
+    now = _new_version()
+
+    for scope in scopes:
+        key = version_key(scope)
+        current = version_cache.get(key) or 0
+        version_cache.set(key, max(current + 1, now), None)
+
+
+def recipe_scopes(recipe_id, previous_state, current_state):
+    """
+    Escopos afetados por uma receita: a propria receita sempre, a home e
+    a categoria apenas se ela estava ou ficou publicada, e as paginas com a
+    navegacao de categorias se a contagem de alguma categoria mudou.
+    """
+    scopes = {f'recipe:{recipe_id}'}
+
+    # A navegacao de categorias (com as contagens) aparece em todas as paginas
+    if published_count_deltas(previous_state, current_state):
+        scopes.add(RELATED_SCOPE)
+
+    for state in (previous_state, current_state):
+        is_published, category_id = state or (False, None)
+
+        if not is_published:
+            continue
+
+        scopes.add(GLOBAL_SCOPE)
+        if category_id is not None:
+            scopes.add(f'category:{category_id}')
+
+    return scopes
+
+
+def category_scopes(category_id):
+    return {GLOBAL_SCOPE, RELATED_SCOPE, f'category:{category_id}'}
+
+
+def category_nav():
+    """
+    Categorias com receitas publicadas, por nome, para a navegacao. O
+    snapshot fica no cache sob a versao do escopo RELATED, que muda quando
+    uma categoria ou a contagem de alguma delas muda.
+    """
+    [version] = get_versions([RELATED_SCOPE])
+    key = f'recipes:category_nav:{version}'
+
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = list(
+            Category.objects.filter(published_count__gt=0).order_by(
+                'name', 'id',
+            ).values('id', 'name', 'published_count')
+        )
+        cache.set(key, snapshot, PAGE_CACHE_TIMEOUT)
+
+    return snapshot
+
+
+def published_category(category_id):
+    """Categoria do snapshot da navegacao ou None se vazia/inexistente"""
+    for category in category_nav():
+        if category['id'] == category_id:
+            return category
+    return None
+
+
+def _is_cacheable_request(request):
+    if request.method != 'GET':
+        return False
+
+    if request.user.is_authenticated:
+        return False
+
+    return len(messages.get_messages(request)) == 0
+
+
+def _page_cache_key(request, scopes, kwargs):
+    versions = get_versions([scope.format(**kwargs) for scope in scopes])
+    url_hash = hashlib.md5(
+        request.get_full_path().encode('utf-8')
+    ).hexdigest()
+    return 'recipes:page:{}:{}'.format(
+        url_hash, ':'.join(str(version) for version in versions)
+    )
+
+
+def _should_store(response):
+    return response.status_code == 200 and not response.cookies
+
+
+def versioned_page_cache(*scopes):
+    """
+    Cache da resposta inteira para visitantes anonimos. A chave combina a URL
+    (com query string) e as versoes dos escopos, que podem usar os kwargs da
+    view, ex.: @versioned_page_cache('category:{category_id}').
+    Funciona com views sync e async.
+    """
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_wrapped_view(request, *args, **kwargs):
+                # Usuario e sessao podem precisar do banco
+                if not await sync_to_async(_is_cacheable_request)(request):
+                    return await view_func(request, *args, **kwargs)
+
+                key = await sync_to_async(_page_cache_key)(
+                    request, scopes, kwargs
+                )
+                response = await cache.aget(key)
+                if response is not None:
+                    return response
+
+                response = await view_func(request, *args, **kwargs)
+
+                if _should_store(response):
+                    await cache.aset(key, response, PAGE_CACHE_TIMEOUT)
+
+                return response
+            return _async_wrapped_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_cache_key(request, scopes, kwargs)
+
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view_func(request, *args, **kwargs)
+
+            if _should_store(response):
+                cache.set(key, response, PAGE_CACHE_TIMEOUT)
+
+            return response
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from utils.pagination import COUNT_CACHE_TIMEOUT
+
+from .caching import (GLOBAL_SCOPE, PAGE_CACHE_TIMEOUT, PUBLISHED_COUNT_KEY,
+                      RELATED_SCOPE, get_versions, published_category,
+                      versions_changed_at)
+from .models import Recipe
+
+LISTING_MAX_AGE = 60
+DETAIL_MAX_AGE = 60 * 5
+
+
+def _make_etag(*parts):
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _memoize_on_request(func):
+    """
+    O decorator condition chama etag_func e last_modified_func separadamente;
+    guardamos o resultado no request para fazer uma consulta so.
+    """
+    @wraps(func)
+    def _wrapped(request, **kwargs):
+        memo = request.__dict__.setdefault('_recipes_validators', {})
+        key = (func.__name__, tuple(sorted(kwargs.items())))
+
+        if key not in memo:
+            memo[key] = func(request, **kwargs)
+
+        return memo[key]
+    return _wrapped
+
+
+@_memoize_on_request
+def home_validators(request):
+    return _listing_validators(
+        'home',
+        Recipe.objects.published(),
+        [GLOBAL_SCOPE],
+        PUBLISHED_COUNT_KEY,
+    )
+
+
+@_memoize_on_request
+def category_validators(request, category_id):
+    # Categoria vazia: sem validadores, a view responde 404
+    if published_category(category_id) is None:
+        return None, None
+
+    return _listing_validators(
+        f'category:{category_id}',
+        Recipe.objects.published().filter(category_id=category_id),
+        [f'category:{category_id}', RELATED_SCOPE],
+    )
+
+
+@_memoize_on_request
+def recipe_validators(request, id):
+    updated_at = Recipe.objects.published().filter(
+        pk=id,
+    ).values_list('updated_at', flat=True).first()
+
+    if updated_at is None:
+        return None, None
+
+    versions = get_versions([f'recipe:{id}', RELATED_SCOPE])
+    return (
+        _make_etag(id, updated_at.isoformat(), versions),
+        _last_modified(updated_at, versions),
+    )
+
+
+def _last_modified(updated_at, versions):
+    """
+    updated_at nao muda quando uma receita mais antiga sai da listagem, uma
+    categoria e renomeada ou um autor e editado; as versoes dos escopos sim.
+    """
+    changed_at = versions_changed_at(versions)
+    return max(updated_at, changed_at) if updated_at else changed_at
+
+
+def _listing_validators(name, queryset, scopes, count_cache_key=None):
+    """
+    MAX(updated_at) e COUNT ficam no cache sob as versoes dos escopos, que
+    mudam a cada alteracao que afeta a listagem; assim um 304 ou uma pagina
+    vinda do cache nao precisam de consulta.
+    """
+    versions = get_versions(scopes)
+    key = f'recipes:validators:{name}:' + ':'.join(map(str, versions))
+
+    result = cache.get(key)
+    if result is None:
+        result = queryset.aggregate(
+            last_modified=Max('updated_at'),
+            total=Count('id'),
+        )
+        cache.set(key, result, PAGE_CACHE_TIMEOUT)
+        # O mesmo COUNT serve para o paginador da view
+        if count_cache_key:
+            cache.add(count_cache_key, result['total'], COUNT_CACHE_TIMEOUT)
+
+    last_modified = result['last_modified']
+    etag = _make_etag(
+        name,
+        last_modified.isoformat() if last_modified else None,
+        result['total'],
+        versions,
+    )
+    return etag, _last_modified(last_modified, versions)
+
+
+def _conditional_headers(etag, last_modified):
+    if etag is not None:
+        etag = quote_etag(etag)
+    if last_modified is not None:
+        last_modified = int(last_modified.timestamp())
+    return etag, last_modified
+
+
+def _set_conditional_headers(request, response, etag, last_modified):
+    # Mesmo comportamento do decorator condition do Django
+    if request.method not in ('GET', 'HEAD'):
+        return
+
+    if last_modified and not response.has_header('Last-Modified'):
+        response.headers['Last-Modified'] = http_date(last_modified)
+    if etag:
+        response.headers.setdefault('ETag', etag)
+
+
+def conditional_view(validators):
+    def decorator(view_func):
+        if not asyncio.iscoroutinefunction(view_func):
+            return condition(
+                etag_func=(
+                    lambda request, **kwargs: validators(request, **kwargs)[0]
+                ),
+                last_modified_func=(
+                    lambda request, **kwargs: validators(request, **kwargs)[1]
+                ),
+            )(view_func)
+
+        # O condition do Django 4.2 nao aceita views async
+        @wraps(view_func)
+        async def _async_wrapped_view(request, *args, **kwargs):
+            etag, last_modified = _conditional_headers(
+                *await sync_to_async(validators)(request, **kwargs)
+            )
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified,
+            )
+
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+
+            _set_conditional_headers(request, response, etag, last_modified)
+            return response
+        return _async_wrapped_view
+    return decorator
+
+
+def _is_private(request):
+    return request.user.is_authenticated or bool(
+        messages.get_messages(request)
+    )
+
+
+def _apply_cache_policy(response, private, max_age):
+    if private:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=max_age)
+
+
+def cache_policy(max_age):
+    """
+    Visitantes anonimos recebem respostas publicas, que um cache intermediario
+    pode guardar; usuarios logados ou com mensagens recebem respostas privadas.
+    """
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_wrapped_view(request, *args, **kwargs):
+                response = await view_func(request, *args, **kwargs)
+
+                if response.status_code in (200, 304):
+                    private = await sync_to_async(_is_private)(request)
+                    _apply_cache_policy(response, private, max_age)
+
+                return response
+            return _async_wrapped_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+
+            if response.status_code in (200, 304):
+                _apply_cache_policy(response, _is_private(request), max_age)
+
+            return response
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,96 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image
+
+COVER_WIDTHS = (320, 640, 1280)
+
+COVER_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True,
+             'progressive': True},
+}
+
+
+def variants_are_current(recipe):
+    return recipe.cover_variants.get('source') == (recipe.cover.name or None)
+
+
+def _variant_name(source_name, width, extension):
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}-{width}.{extension}')
+
+
+def _delete_variant_files(variants):
+    for extension in COVER_FORMATS:
+        for _width, name in variants.get(extension, []):
+            default_storage.delete(name)
+
+
+def _encode(image, extension):
+    options = dict(COVER_FORMATS[extension])
+
+    if extension == 'jpeg' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGBA')
+
+    buffer = BytesIO()
+    image.save(buffer, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def build_cover_variants(source_name):
+    """
+    Gera as versoes redimensionadas da capa em todos os formatos e retorna
+    o dicionario guardado em Recipe.cover_variants.
+    """
+    variants = {'source': source_name}
+
+    with default_storage.open(source_name, 'rb') as source_file:
+        with Image.open(source_file) as image:
+            image.load()
+
+    original_width, original_height = image.size
+    widths = sorted({min(width, original_width) for width in COVER_WIDTHS})
+
+    for width in widths:
+        height = max(1, round(original_height * width / original_width))
+        resized = image.resize((width, height), Image.LANCZOS)
+
+        for extension in COVER_FORMATS:
+            name = default_storage.save(
+                _variant_name(source_name, width, extension),
+                _encode(resized, extension),
+            )
+            variants.setdefault(extension, []).append([width, name])
+
+    return variants
+
+
+def update_cover_variants(recipe):
+    """
+    Regera as variantes se a capa mudou. Grava com update() para nao
+    disparar os sinais de save de novo.
+    """
+    if variants_are_current(recipe):
+        return False
+
+    _delete_variant_files(recipe.cover_variants)
+
+    if recipe.cover:
+        variants = build_cover_variants(recipe.cover.name)
+    else:
+        variants = {}
+
+    recipe.cover_variants = variants
+    recipe.updated_at = timezone.now()
+    type(recipe).objects.filter(pk=recipe.pk).update(
+        cover_variants=variants,
+        updated_at=recipe.updated_at,
+    )
+    return True
@@ -0,0 +1,128 @@
+import json
+import platform
+import sys
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from recipes.models import Recipe
+from utils import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede latencia (p50/p95/p99), vazao e queries por requisicao das '
+        'rotas de recipes e authors em um banco de teste isolado'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            choices=sorted(benchmark.DATASET_SIZES),
+            default='10k',
+            help='Quantidade de receitas geradas',
+        )
+        parser.add_argument(
+            '--recipes',
+            type=int,
+            help='Quantidade exata de receitas (sobrepoe --size)',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=50,
+            help='Requisicoes por rota (e por nivel de concorrencia)',
+        )
+        parser.add_argument(
+            '--concurrency', default='1,4,16',
+            help='Niveis de concorrencia do modo servidor, separados por virgula',
+        )
+        parser.add_argument(
+            '--mode', choices=['client', 'server', 'all'], default='all',
+        )
+        parser.add_argument(
+            '--cold-cache', action='store_true',
+            help='Limpa o cache antes de cada medicao',
+        )
+        parser.add_argument(
+            '--db-file',
+            help='Arquivo SQLite do banco de teste; e reaproveitado entre '
+                 'execucoes para evitar gerar os dados de novo',
+        )
+        parser.add_argument(
+            '--output', help='Arquivo JSON de saida (padrao: stdout)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            concurrency_levels = [
+                int(level) for level in options['concurrency'].split(',')
+            ]
+        except ValueError:
+            raise CommandError('--concurrency deve ser uma lista de inteiros')
+
+        recipes = options['recipes'] or benchmark.DATASET_SIZES[options['size']]
+        keepdb = bool(options['db_file'])
+        if keepdb:
+            connection.settings_dict['TEST']['NAME'] = options['db_file']
+
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb,
+        )
+        try:
+            # Todas as requisicoes saem do mesmo IP: sem o rate limit, a
+            # busca e o login mediriam respostas 429
+            with override_settings(
+                ALLOWED_HOSTS=['testserver', '127.0.0.1', 'localhost'],
+                RATE_LIMIT_ENABLED=False,
+            ):
+                report = self.run(recipes, concurrency_levels, options)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=keepdb,
+            )
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+            self.stderr.write(f'Relatorio salvo em {options["output"]}')
+        else:
+            self.stdout.write(output)
+
+    def run(self, recipes, concurrency_levels, options):
+        existing = Recipe.objects.count()
+        if existing < recipes:
+            self.stderr.write(f'Gerando {recipes - existing} receitas...')
+            benchmark.seed_dataset(recipes)
+
+        routes = benchmark.build_routes()
+        results = []
+
+        if options['mode'] in ('client', 'all'):
+            self.stderr.write('Modo client...')
+            results += benchmark.run_client_benchmark(
+                routes, options['requests'], options['cold_cache'],
+            )
+        if options['mode'] in ('server', 'all'):
+            self.stderr.write('Modo servidor...')
+            results += benchmark.run_server_benchmark(
+                routes, options['requests'], concurrency_levels,
+                options['cold_cache'],
+            )
+
+        return {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': sys.version.split()[0],
+                'django': django.get_version(),
+                'platform': platform.platform(),
+                'database': connection.vendor,
+                'recipes': Recipe.objects.count(),
+                'requests_per_route': options['requests'],
+                'concurrency_levels': concurrency_levels,
+                'cold_cache': options['cold_cache'],
+            },
+            'results': results,
+        }
@@ -0,0 +1,73 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from authors.models import users_with_email
+from recipes import search_index
+from recipes.search_cache import SEARCH_RESULTS_LIMIT
+from recipes.models import Recipe
+
+# "SCAN tabela" sem "USING ... INDEX" significa leitura da tabela inteira
+TABLE_SCAN = re.compile(r'\bSCAN (\w+)\b(?! USING)(?! VIRTUAL TABLE)')
+
+
+def view_querysets(per_page=9):
+    published_cards = Recipe.objects.published_cards()
+
+    querysets = {
+        'home': published_cards.order_by('-id')[:per_page],
+        'home count': Recipe.objects.published(),
+        'category': published_cards.filter(
+            category__id=1,
+        ).order_by('-id')[:per_page],
+        'recipe': Recipe.objects.published().filter(pk=1),
+        'dashboard': Recipe.objects.drafts_of(author=1).order_by('-id')[:per_page],
+        'admin': Recipe.objects.order_by('-created_at')[:10],
+        'search page': published_cards.filter(id__in=range(1, per_page + 1)),
+        'register email': users_with_email('Maria@Example.com'),
+    }
+
+    if search_index.is_enabled():
+        querysets['search ids'] = search_index.search(
+            Recipe.objects.published(), 'bolo'
+        ).values_list('id', flat=True)[:SEARCH_RESULTS_LIMIT]
+
+    return querysets
+
+
+def find_table_scans(querysets):
+    scans = {}
+
+    for name, queryset in querysets.items():
+        plan = queryset.explain()
+        tables = TABLE_SCAN.findall(plan)
+
+        if tables:
+            scans[name] = (tables, plan)
+
+    return scans
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa EXPLAIN QUERY PLAN nas consultas das views e falha se '
+        'alguma delas fizer leitura completa de tabela'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Disponivel apenas para SQLite.')
+
+        scans = find_table_scans(view_querysets())
+
+        for name, (tables, plan) in scans.items():
+            self.stderr.write(f'{name}: SCAN em {", ".join(tables)}')
+            self.stderr.write(plan)
+
+        if scans:
+            raise CommandError(
+                f'{len(scans)} consulta(s) sem indice: {", ".join(scans)}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Todas as consultas usam indice.'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from recipes import images
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = 'Gera as variantes redimensionadas (WebP/JPEG) das capas existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regera mesmo as capas que ja tem variantes atualizadas',
+        )
+        parser.add_argument('--chunk-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.exclude(cover='').only(
+            'id', 'cover', 'cover_variants', 'updated_at',
+        ).order_by('id')
+
+        generated = 0
+
+        for recipe in recipes.iterator(chunk_size=options['chunk_size']):
+            if options['force']:
+                recipe.cover_variants = {
+                    **recipe.cover_variants, 'source': None,
+                }
+
+            try:
+                if images.update_cover_variants(recipe):
+                    generated += 1
+            except (OSError, ValueError) as error:
+                self.stderr.write(f'Receita {recipe.id}: {error}')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{generated} capa(s) processada(s).')
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes import search_index
+
+
+class Command(BaseCommand):
+    help = 'Reconstroi o indice de busca textual (FTS5) das receitas'
+
+    def handle(self, *args, **options):
+        if not search_index.is_enabled():
+            raise CommandError(
+                'O indice FTS5 so existe quando o banco e SQLite.'
+            )
+
+        total = search_index.rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'{total} receitas indexadas.')
+        )
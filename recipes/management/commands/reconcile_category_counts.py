@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from recipes.caching import GLOBAL_SCOPE, RELATED_SCOPE, bump_versions
+from recipes.models import Category, Recipe
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula Category.published_count a partir das receitas e corrige '
+        'as categorias em que o contador desviou'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='So lista as diferencas, sem gravar',
+        )
+
+    def handle(self, *args, **options):
+        categories = Category.objects.annotate(
+            actual=Count('recipe', filter=Q(recipe__is_published=True)),
+        ).values_list('id', 'name', 'published_count', 'actual')
+
+        drifted = [
+            (category_id, name, stored, actual)
+            for category_id, name, stored, actual in categories
+            if stored != actual
+        ]
+
+        for category_id, name, stored, actual in drifted:
+            self.stdout.write(f'{name} (#{category_id}): {stored} -> {actual}')
+
+        if drifted and not options['dry_run']:
+            # Recontadas no proprio UPDATE: uma publicacao entre a leitura
+            # acima e a escrita nao se perde
+            published = Recipe.objects.filter(
+                category=OuterRef('pk'), is_published=True,
+            ).order_by().values('category').annotate(
+                total=Count('id'),
+            ).values('total')
+
+            Category.objects.filter(
+                pk__in=[category_id for category_id, *_ in drifted],
+            ).update(published_count=Coalesce(Subquery(published), 0))
+            bump_versions([GLOBAL_SCOPE, RELATED_SCOPE])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(drifted)} categoria(s) com contagem divergente'
+            f'{" (dry-run)" if options["dry_run"] else " corrigida(s)"}.'
+        ))
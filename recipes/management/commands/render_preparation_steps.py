@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.caching import GLOBAL_SCOPE, RELATED_SCOPE, bump_versions
+from recipes.models import Recipe
+from recipes.rendering import render_preparation_steps
+
+
+class Command(BaseCommand):
+    help = (
+        'Preenche Recipe.preparation_steps_rendered em lotes, para receitas '
+        'criadas antes da coluna ou gravadas sem passar pelo save'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Renderiza de novo todas as receitas (ex.: apos mudar a '
+                 'lista de tags permitidas)',
+        )
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.order_by('id').only(
+            'id', 'preparation_steps', 'preparation_steps_is_html',
+        )
+        if not options['force']:
+            recipes = recipes.filter(preparation_steps_rendered='')
+
+        rendered = 0
+        last_id = 0
+
+        # Lotes por faixa de id: cada um e uma transacao curta e o UPDATE de
+        # um lote nao muda quais linhas o proximo encontra
+        while True:
+            batch = list(recipes.filter(id__gt=last_id)[:options['chunk_size']])
+            if not batch:
+                break
+
+            for recipe in batch:
+                recipe.preparation_steps_rendered = render_preparation_steps(
+                    recipe.preparation_steps, recipe.preparation_steps_is_html,
+                )
+
+            with transaction.atomic():
+                Recipe.objects.bulk_update(
+                    batch, ['preparation_steps_rendered'],
+                )
+
+            rendered += len(batch)
+            last_id = batch[-1].id
+
+        if rendered:
+            bump_versions([GLOBAL_SCOPE, RELATED_SCOPE])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{rendered} receita(s) renderizada(s).')
+        )
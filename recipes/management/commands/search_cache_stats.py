@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from recipes import search_cache
+
+
+class Command(BaseCommand):
+    help = (
+        'Mostra acertos, falhas e a taxa de acerto do cache da busca '
+        '(com LocMemCache os numeros sao do proprio processo)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true', help='Zera os contadores',
+        )
+
+    def handle(self, *args, **options):
+        stats = search_cache.stats()
+        ratio = stats['hit_ratio']
+
+        self.stdout.write(
+            f'{stats["hits"]} acerto(s), {stats["misses"]} falha(s), '
+            f'taxa de acerto: {"-" if ratio is None else f"{ratio:.1%}"}'
+        )
+
+        if options['reset']:
+            search_cache.reset_stats()
@@ -0,0 +1,184 @@
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from recipes import search_index
+from recipes.caching import (GLOBAL_SCOPE, PUBLISHED_COUNT_KEY, RELATED_SCOPE,
+                             bump_versions)
+from recipes.models import Category, Recipe
+from utils import factory
+
+
+def chunk_ranges(total, chunk_size):
+    """
+    >>> list(chunk_ranges(5, 2))
+    [(0, 2), (2, 2), (4, 1)]
+    """
+    for start in range(0, total, chunk_size):
+        yield start, min(chunk_size, total - start)
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera usuarios, categorias e receitas em massa com bulk_create; os '
+        'dados sao produzidos em paralelo por um pool de processos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10_000)
+        parser.add_argument(
+            '--users', type=int,
+            help='Padrao: uma conta para cada 20 receitas',
+        )
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Linhas por INSERT do bulk_create',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=20_000,
+            help='Linhas geradas por tarefa do pool (uma transacao cada)',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processos geradores; 1 gera tudo no processo atual',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Semente base do Faker; cada lote usa seed + numero do lote',
+        )
+        parser.add_argument(
+            '--days', type=int, default=5 * 365,
+            help='Janela em dias para espalhar o created_at das receitas',
+        )
+        parser.add_argument('--published-ratio', type=float, default=0.9)
+        parser.add_argument(
+            '--steps-chars', type=int, default=1000,
+            help='Tamanho aproximado do modo de preparo',
+        )
+        parser.add_argument(
+            '--skip-search-index', action='store_true',
+            help='Nao reconstroi o indice FTS5 ao final',
+        )
+
+    def handle(self, *args, **options):
+        if options['recipes'] < 0 or options['categories'] < 1:
+            raise CommandError('Quantidades invalidas.')
+        if options['batch_size'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--batch-size e --chunk-size devem ser >= 1')
+
+        users = options['users'] or max(1, options['recipes'] // 20)
+        # Prefixo da execucao: slugs e usernames nao colidem com dados
+        # ja existentes nem com outra execucao do comando
+        prefix = secrets.token_hex(4)
+        started = time.perf_counter()
+
+        Category.objects.bulk_create(
+            [
+                Category(**row) for row in factory.make_category_rows(
+                    0, options['categories'], prefix,
+                )
+            ],
+            batch_size=options['batch_size'],
+        )
+        category_ids = list(
+            Category.objects.filter(
+                name__startswith=f'Categoria {prefix}-',
+            ).values_list('id', flat=True)
+        )
+
+        # Hash calculado uma vez so: make_password e caro de proposito
+        password = make_password(None)
+        self.generate(
+            options, users, partial(factory.make_user_rows, prefix=prefix),
+            lambda rows: User.objects.bulk_create(
+                [User(password=password, **row) for row in rows],
+                batch_size=options['batch_size'],
+            ),
+        )
+        author_ids = list(
+            User.objects.filter(
+                username__startswith=f'{prefix}-',
+            ).values_list('id', flat=True)
+        )
+
+        with factory.keep_timestamps(Recipe):
+            self.generate(
+                options, options['recipes'],
+                partial(
+                    factory.make_recipe_rows,
+                    prefix=prefix,
+                    days=options['days'],
+                    published_ratio=options['published_ratio'],
+                    steps_chars=options['steps_chars'],
+                ),
+                lambda rows: Recipe.objects.bulk_create(
+                    [Recipe(**row) for row in rows],
+                    batch_size=options['batch_size'],
+                ),
+                initargs=(author_ids, category_ids),
+            )
+
+        # bulk_create nao dispara os sinais de recipes.signals
+        if not options['skip_search_index'] and search_index.is_enabled():
+            search_index.rebuild_index()
+        call_command('reconcile_category_counts', stdout=StringIO())
+        cache.delete(PUBLISHED_COUNT_KEY)
+        bump_versions([GLOBAL_SCOPE, RELATED_SCOPE])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["categories"]} categoria(s), {users} usuario(s) e '
+            f'{options["recipes"]} receita(s) criados em '
+            f'{time.perf_counter() - started:.1f}s.'
+        ))
+
+    def generate(self, options, total, make_rows, insert_rows, initargs=()):
+        """
+        Os processos do pool so geram os dicts; a insercao fica no processo
+        principal (o SQLite aceita um escritor por vez). Enquanto um lote e
+        gravado, os proximos ja estao sendo gerados.
+        """
+        tasks = [
+            (options['seed'] + number, start, count)
+            for number, (start, count) in enumerate(
+                chunk_ranges(total, options['chunk_size'])
+            )
+        ]
+        run = partial(_run_task, make_rows)
+
+        if options['workers'] <= 1 or len(tasks) <= 1:
+            factory.init_seed_worker(*(initargs or ([], [])))
+            results = map(run, tasks)
+            self.insert(results, insert_rows, total)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=options['workers'],
+            initializer=factory.init_seed_worker,
+            initargs=initargs or ([], []),
+        ) as executor:
+            self.insert(executor.map(run, tasks), insert_rows, total)
+
+    def insert(self, results, insert_rows, total):
+        inserted = 0
+
+        for rows in results:
+            with transaction.atomic():
+                insert_rows(rows)
+            inserted += len(rows)
+            self.stderr.write(f'{inserted}/{total}')
+
+
+def _run_task(make_rows, task):
+    seed, start, count = task
+    return make_rows(seed, start, count)
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_published_counts(apps, schema_editor):
+    Category = apps.get_model('recipes', 'Category')
+    Recipe = apps.get_model('recipes', 'Recipe')
+
+    published = Recipe.objects.filter(
+        category=OuterRef('pk'), is_published=True,
+    ).order_by().values('category').annotate(total=Count('id')).values('total')
+
+    Category.objects.update(published_count=Coalesce(Subquery(published), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipe_cover_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='published_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_published_counts, migrations.RunPython.noop),
+    ]
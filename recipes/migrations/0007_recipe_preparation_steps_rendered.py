@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_category_published_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='preparation_steps_rendered',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
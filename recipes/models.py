@@ -1,13 +1,68 @@
 from django.contrib.auth.models import User
 from django.db import models
 
+from .rendering import render_preparation_steps
+
 
 class Category(models.Model):
     name = models.CharField(max_length=65)
+    # Receitas publicadas na categoria, mantido por recipes.signals com F();
+    # reconcile_category_counts corrige desvios
+    published_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Um save comum gravaria o published_count lido antes, desfazendo
+        # incrementos feitos no meio tempo
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'published_count'
+            ]
+        super().save(*args, **kwargs)
+
+
+class RecipeQuerySet(models.QuerySet):
+    # Colunas usadas por recipes/partials/recipe.html nas listagens
+    CARD_FIELDS = [
+        'id',
+        'title',
+        'description',
+        'preparation_time',
+        'preparation_time_unit',
+        'servings',
+        'servings_unit',
+        'created_at',
+        'updated_at',
+        'cover',
+        'cover_variants',
+        'category__id',
+        'category__name',
+        'author__first_name',
+        'author__last_name',
+        'author__username',
+    ]
+
+    def published(self):
+        return self.filter(is_published=True)
+
+    def cards(self):
+        return self.select_related(
+            'author', 'category',
+        ).only(*self.CARD_FIELDS)
+
+    def published_cards(self):
+        return self.published().cards()
+
+    def drafts_of(self, author):
+        return self.filter(
+            is_published=False,
+            author=author,
+        ).only('id', 'title')
+
+
 class Recipe(models.Model):
     title = models.CharField(max_length=65)
     description = models.CharField(max_length=165)
@@ -18,10 +73,16 @@ class Recipe(models.Model):
     servings_unit = models.CharField(max_length=65)
     preparation_steps = models.TextField()
     preparation_steps_is_html = models.BooleanField(default=False)
+    # HTML pronto de preparation_steps, gerado no save (recipes.rendering)
+    preparation_steps_rendered = models.TextField(
+        blank=True, default='', editable=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_published = models.BooleanField(default=False)
     cover = models.ImageField(upload_to='recipes/covers/%Y/%m/%d/', blank=True, default='')
+    # Gerado por recipes.images a partir de cover: source, webp e jpeg
+    cover_variants = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey(
         Category, on_delete=models.SET_NULL, blank=True, default=None, null=True
     )
@@ -29,5 +90,56 @@ class Recipe(models.Model):
         User, on_delete=models.SET_NULL, null=True, blank=True, default=None
     )
 
+    objects = RecipeQuerySet.as_manager()
+
+    class Meta:
+        # Indices parciais: o Django gera WHERE "is_published" (sem "= 1"),
+        # que so consegue usar um indice com a mesma condicao.
+        indexes = [
+            # home: is_published=True ORDER BY -id
+            models.Index(
+                fields=['-id'],
+                condition=models.Q(is_published=True),
+                name='recipe_published_id_idx',
+            ),
+            # category: category_id=? AND is_published ORDER BY -id
+            models.Index(
+                fields=['category', '-id'],
+                condition=models.Q(is_published=True),
+                name='recipe_category_pub_id_idx',
+            ),
+            # dashboard: author_id=? AND is_published=False
+            models.Index(
+                fields=['author', '-id'],
+                condition=models.Q(is_published=False),
+                name='recipe_author_draft_id_idx',
+            ),
+            # admin: ordering = ['-created_at']
+            models.Index(
+                fields=['-created_at'],
+                name='recipe_created_at_idx',
+            ),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    def render_preparation_steps(self):
+        self.preparation_steps_rendered = render_preparation_steps(
+            self.preparation_steps, self.preparation_steps_is_html,
+        )
+
+    def save(self, *args, **kwargs):
+        source_fields = {'preparation_steps', 'preparation_steps_is_html'}
+        update_fields = kwargs.get('update_fields')
+
+        # Com um dos campos de origem adiado nao ha o que renderizar
+        if not source_fields & self.get_deferred_fields():
+            if update_fields is None:
+                self.render_preparation_steps()
+            elif source_fields & set(update_fields):
+                self.render_preparation_steps()
+                kwargs['update_fields'] = {
+                    *update_fields, 'preparation_steps_rendered',
+                }
+        super().save(*args, **kwargs)
@@ -0,0 +1,306 @@
+"""
+Indice de prefixos em memoria para o autocomplete da busca. Cada palavra
+normalizada (minuscula, sem acento) dos titulos publicados aponta para a
+lista das receitas que a contem, ordenada por created_at. Uma consulta
+acha as palavras com o prefixo digitado na lista ordenada do vocabulario
+(bisect) e junta as listas delas da mais recente para a mais antiga.
+
+O indice e montado na primeira consulta de cada processo (ou no warm-up,
+com WARMUP=1) e depois so recebe deltas. No processo que salvou, os sinais
+de Recipe aplicam a mudanca na hora e gravam o id da receita em um log no
+cache de versoes, compartilhado entre os processos; os outros processos
+releem do banco apenas as receitas que entraram no log desde a ultima
+consulta.
+"""
+import bisect
+import heapq
+import threading
+from itertools import islice
+
+from django.core.cache import caches
+
+from recipes.models import Recipe
+from recipes.search_cache import normalize_term
+
+SUGGESTIONS_LIMIT = 10
+
+# Candidatos examinados por consulta; limita o custo quando ha mais de uma
+# palavra e poucas receitas tem todas
+MAX_SCANNED = 300
+
+# Prefixos curtos casam com muitas palavras; o resultado deles fica guardado
+# ate a proxima alteracao do indice
+CACHED_PREFIX_LENGTH = 2
+
+CHANGES_KEY = 'recipes:autocomplete:changes'
+# Um processo que fica mais atrasado que isso no log (entradas expiradas ou
+# mudancas demais) remonta o indice inteiro
+CHANGE_TIMEOUT = 60 * 60 * 24
+MAX_PENDING_CHANGES = 10_000
+
+
+def title_words(title):
+    """
+    >>> title_words('Pão de Queijo de minas')
+    ['pao', 'de', 'queijo', 'minas']
+    """
+    return list(dict.fromkeys(normalize_term(title).split()))
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Ultima posicao do log de mudancas ja aplicada
+        self.position = 0
+        self.titles = {}
+        self.postings = {}
+        self.vocabulary = []
+        self.short_prefixes = {}
+
+    def add(self, recipe_id, title, created_at):
+        rank = (created_at.timestamp(), recipe_id)
+        words = title_words(title)
+        # ' pao de queijo ': palavras e prefixos viram buscas de substring
+        text = f' {" ".join(words)} '
+
+        with self.lock:
+            self._remove(recipe_id)
+            self.titles[recipe_id] = (title, rank, text)
+
+            for word in words:
+                postings = self.postings.get(word)
+                if postings is None:
+                    postings = self.postings[word] = []
+                    bisect.insort(self.vocabulary, word)
+                bisect.insort(postings, rank)
+
+            self._forget_short_prefixes(words)
+
+    def remove(self, recipe_id):
+        with self.lock:
+            self._remove(recipe_id)
+
+    def _remove(self, recipe_id):
+        entry = self.titles.pop(recipe_id, None)
+        if entry is None:
+            return
+
+        _, rank, text = entry
+        words = text.split()
+        for word in words:
+            postings = self.postings[word]
+            del postings[bisect.bisect_left(postings, rank)]
+
+            if not postings:
+                del self.postings[word]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, word)]
+
+        self._forget_short_prefixes(words)
+
+    def _forget_short_prefixes(self, words):
+        for word in words:
+            for length in range(1, CACHED_PREFIX_LENGTH + 1):
+                self.short_prefixes.pop(word[:length], None)
+
+    def words_with_prefix(self, prefix):
+        """
+        >>> index = PrefixIndex()
+        >>> index.vocabulary = ['bolo', 'bolonhesa', 'pao', 'queijo']
+        >>> index.words_with_prefix('bol')
+        ['bolo', 'bolonhesa']
+        """
+        # Fim da faixa: o primeiro texto maior que qualquer palavra com o
+        # prefixo ('bom' para 'bol'); as duas pontas saem por bisect
+        after = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, after, start)
+        return self.vocabulary[start:end]
+
+    def suggest(self, text, limit=SUGGESTIONS_LIMIT):
+        """
+        Titulos em que uma palavra comeca com o ultimo termo digitado e as
+        demais palavras digitadas aparecem inteiras, mais recentes primeiro.
+        """
+        words = normalize_term(text).split()
+        if not words:
+            return []
+
+        *required, prefix = words
+        with self.lock:
+            if not required and len(prefix) <= CACHED_PREFIX_LENGTH:
+                cached = self.short_prefixes.get(prefix)
+                if cached is None:
+                    cached = self._suggest(prefix, [], SUGGESTIONS_LIMIT)
+                    self.short_prefixes[prefix] = cached
+                return cached[:limit]
+
+            return self._suggest(prefix, required, limit)
+
+    def _suggest(self, prefix, required, limit):
+        if required:
+            # Percorre a palavra completa mais rara; as outras sao conferidas
+            # nas palavras ja normalizadas de cada titulo
+            rarest = min(required, key=lambda word: len(self.postings.get(word, ())))
+            candidates = reversed(self.postings.get(rarest, []))
+        else:
+            candidates = heapq.merge(
+                *(reversed(self.postings[word])
+                  for word in self.words_with_prefix(prefix)),
+                reverse=True,
+            )
+
+        needles = [f' {word} ' for word in required] + [f' {prefix}']
+        suggestions = []
+        seen = set()
+
+        for _, recipe_id in islice(candidates, MAX_SCANNED):
+            if recipe_id in seen:
+                continue
+            seen.add(recipe_id)
+
+            title, _, text = self.titles[recipe_id]
+            if required and not all(needle in text for needle in needles):
+                continue
+
+            suggestions.append({'id': recipe_id, 'title': title})
+            if len(suggestions) == limit:
+                break
+
+        return suggestions
+
+    def build(self, chunk_size=10_000):
+        # Lida antes: mudancas feitas durante a montagem sao reaplicadas
+        self.position = changes_position()
+        recipes = Recipe.objects.published().order_by(
+            'created_at', 'id',
+        ).values_list('id', 'title', 'created_at')
+
+        # Em ordem de created_at cada insort vira um append
+        for recipe_id, title, created_at in recipes.iterator(chunk_size):
+            self.add(recipe_id, title, created_at)
+
+    def apply_changes(self, recipe_ids):
+        """Rele as receitas alteradas: publicadas entram, as demais saem"""
+        published = {
+            recipe_id: (title, created_at)
+            for recipe_id, title, created_at in Recipe.objects.published(
+            ).filter(pk__in=recipe_ids).values_list('id', 'title', 'created_at')
+        }
+
+        for recipe_id in recipe_ids:
+            if recipe_id in published:
+                self.add(recipe_id, *published[recipe_id])
+            else:
+                self.remove(recipe_id)
+
+
+def _change_cache():
+    # O mesmo alias das versoes de pagina: compartilhado entre os processos
+    return caches['versions']
+
+
+def change_key(position):
+    return f'{CHANGES_KEY}:{position}'
+
+
+def changes_position():
+    return _change_cache().get(CHANGES_KEY, 0)
+
+
+def log_change(recipe_id):
+    """Grava a receita no log de mudancas e devolve a posicao dela"""
+    change_cache = _change_cache()
+    change_cache.add(CHANGES_KEY, 0, None)
+
+    # incr so e atomico em alguns backends: o add garante que duas mudancas
+    # nunca dividam a mesma posicao
+    while True:
+        position = change_cache.incr(CHANGES_KEY)
+        if change_cache.add(change_key(position), recipe_id, CHANGE_TIMEOUT):
+            return position
+
+
+_index = None
+_build_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+
+
+def _build():
+    index = PrefixIndex()
+    index.build()
+    return index
+
+
+def get_index():
+    global _index
+
+    if _index is None:
+        with _build_lock:
+            if _index is None:
+                _index = _build()
+        return _index
+
+    # Uma thread aplica o log; as outras respondem com o indice como esta
+    position = changes_position()
+    if position != _index.position and _refresh_lock.acquire(blocking=False):
+        try:
+            _refresh(_index, position)
+        finally:
+            _refresh_lock.release()
+
+    return _index
+
+
+def _refresh(index, position):
+    global _index
+
+    keys = [change_key(p) for p in range(index.position + 1, position + 1)]
+    changes = (
+        _change_cache().get_many(keys)
+        if 0 < len(keys) <= MAX_PENDING_CHANGES else {}
+    )
+
+    if len(changes) < len(keys) or not keys:
+        # Log expirado, atrasado demais ou reiniciado (cache limpo)
+        _index = _build()
+        return
+
+    index.apply_changes(set(changes.values()))
+    index.position = position
+
+
+def is_built():
+    return _index is not None
+
+
+def reset_index():
+    global _index
+    _index = None
+
+
+def _log_local_change(recipe_id):
+    position = log_change(recipe_id)
+
+    # A mudanca ja foi aplicada aqui: se nao havia outra pendente, o
+    # indice deste processo nao precisa reler a receita
+    if is_built():
+        with _index.lock:
+            if _index.position == position - 1:
+                _index.position = position
+
+
+def update_recipe(recipe):
+    if is_built():
+        if recipe.is_published:
+            _index.add(recipe.id, recipe.title, recipe.created_at)
+        else:
+            _index.remove(recipe.id)
+
+    _log_local_change(recipe.id)
+
+
+def remove_recipe(recipe_id):
+    if is_built():
+        _index.remove(recipe_id)
+
+    _log_local_change(recipe_id)
@@ -0,0 +1,106 @@
+"""
+HTML pronto do modo de preparo, gerado no save da receita e guardado em
+Recipe.preparation_steps_rendered. Texto puro e escapado e tem as quebras de
+linha trocadas por <br>; HTML passa por uma lista de tags e atributos
+permitidos. O template so imprime o resultado.
+"""
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.template.defaultfilters import linebreaksbr
+
+ALLOWED_TAGS = {
+    'p', 'br', 'ul', 'ol', 'li', 'strong', 'b', 'em', 'i', 'u', 's',
+    'h2', 'h3', 'h4', 'blockquote', 'code', 'pre', 'a', 'hr',
+}
+ALLOWED_ATTRIBUTES = {'a': {'href', 'title'}}
+ALLOWED_URL_SCHEMES = {'http', 'https', 'mailto'}
+
+VOID_TAGS = {'br', 'hr'}
+# Tags removidas junto com todo o conteudo
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template'}
+
+
+def _is_allowed_url(url):
+    scheme = urlsplit(url.strip()).scheme.lower()
+    return not scheme or scheme in ALLOWED_URL_SCHEMES
+
+
+class AllowListSanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = ''.join(
+            f' {name}="{escape(value)}"'
+            for name, value in attrs
+            if name in allowed and value is not None
+            and (name != 'href' or _is_allowed_url(value))
+        )
+        if tag == 'a':
+            rendered += ' rel="nofollow noopener"'
+
+        self.parts.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping -= 1
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+
+        # Fecha tambem as tags abertas dentro desta que ficaram sem fechar
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.parts.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.parts.append(escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        closing = ''.join(f'</{tag}>' for tag in reversed(self.open_tags))
+        return ''.join(self.parts) + closing
+
+
+def sanitize_html(html):
+    """
+    >>> sanitize_html('<p onclick="x()">Asse <b>bem</b><script>alert(1)</script>')
+    '<p>Asse <b>bem</b></p>'
+    >>> sanitize_html('<a href="javascript:alert(1)">link</a>')
+    '<a rel="nofollow noopener">link</a>'
+    """
+    parser = AllowListSanitizer()
+    parser.feed(html)
+    return parser.result()
+
+
+def render_preparation_steps(text, is_html):
+    """
+    >>> render_preparation_steps('Misture.\\nAsse <bem>.', False)
+    'Misture.<br>Asse &lt;bem&gt;.'
+    """
+    if is_html:
+        return sanitize_html(text)
+    return linebreaksbr(text, autoescape=True)
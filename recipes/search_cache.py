@@ -0,0 +1,141 @@
+"""
+Cache das listas de IDs da busca. A chave e o termo normalizado (minusculo,
+sem espacos extras e, com o FTS5, sem acentos) mais a versao do escopo
+global, que muda sempre que uma receita e publicada, despublicada ou uma
+receita publicada e alterada. Cada pagina e um fatia da lista, carregada
+com um unico id__in.
+"""
+import hashlib
+import os
+import unicodedata
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from recipes import search_index
+from recipes.caching import GLOBAL_SCOPE, get_versions
+from recipes.models import Recipe
+
+SEARCH_CACHE_TIMEOUT = int(os.environ.get('SEARCH_CACHE_TIMEOUT', 60 * 5))
+
+# Resultados guardados por termo; paginas alem disso nao existem
+SEARCH_RESULTS_LIMIT = int(os.environ.get('SEARCH_RESULTS_LIMIT', 1000))
+
+HITS_KEY = 'recipes:search:hits'
+MISSES_KEY = 'recipes:search:misses'
+
+
+def normalize_term(search_term, fold_accents=True):
+    """
+    >>> normalize_term('  Pão   de QUEIJO ')
+    'pao de queijo'
+    >>> normalize_term('Pão', fold_accents=False)
+    'pão'
+    """
+    term = ' '.join(search_term.lower().split())
+    if not fold_accents:
+        return term
+
+    decomposed = unicodedata.normalize('NFKD', term)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _cache_key(search_term):
+    # O icontains do fallback diferencia acentos, o FTS5 nao
+    term = normalize_term(search_term, fold_accents=search_index.is_enabled())
+    digest = hashlib.md5(term.encode('utf-8')).hexdigest()
+    [version] = get_versions([GLOBAL_SCOPE])
+    return f'recipes:search:ids:{digest}:{version}'
+
+
+def _result_ids_queryset(search_term):
+    recipes = Recipe.objects.published()
+
+    if search_index.is_enabled():
+        recipes = search_index.search(recipes, search_term)
+    else:
+        recipes = recipes.filter(
+            Q(title__icontains=search_term) |
+            Q(description__icontains=search_term)
+        ).order_by('title', 'id')
+
+    return recipes.values_list('id', flat=True)[:SEARCH_RESULTS_LIMIT]
+
+
+def _count(key):
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def result_ids(search_term):
+    key = _cache_key(search_term)
+    ids = cache.get(key)
+
+    if ids is not None:
+        _count(HITS_KEY)
+        return ids
+
+    _count(MISSES_KEY)
+    ids = list(_result_ids_queryset(search_term))
+    cache.set(key, ids, SEARCH_CACHE_TIMEOUT)
+    return ids
+
+
+async def aresult_ids(search_term):
+    key = _cache_key(search_term)
+    ids = await cache.aget(key)
+
+    if ids is not None:
+        _count(HITS_KEY)
+        return ids
+
+    _count(MISSES_KEY)
+    ids = [recipe_id async for recipe_id in _result_ids_queryset(search_term)]
+    await cache.aset(key, ids, SEARCH_CACHE_TIMEOUT)
+    return ids
+
+
+def _hydrate(page_object, recipes):
+    by_id = {recipe.id: recipe for recipe in recipes}
+    # Receitas removidas entre o cache e agora simplesmente somem da pagina
+    page_object.object_list = [
+        by_id[recipe_id] for recipe_id in page_object.object_list
+        if recipe_id in by_id
+    ]
+    return page_object
+
+
+def hydrate(page_object):
+    ids = list(page_object.object_list)
+    return _hydrate(
+        page_object, Recipe.objects.published_cards().filter(id__in=ids),
+    )
+
+
+async def ahydrate(page_object):
+    ids = list(page_object.object_list)
+    recipes = [
+        recipe async for recipe in
+        Recipe.objects.published_cards().filter(id__in=ids)
+    ]
+    return _hydrate(page_object, recipes)
+
+
+def stats():
+    """Acertos, falhas e a fracao de buscas respondidas pelo cache"""
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counts.get(HITS_KEY, 0)
+    misses = counts.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else None,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,92 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'recipes_recipe_fts'
+
+# Pesos do bm25 na ordem das colunas: title, description, preparation_steps
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def is_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(search_term):
+    """
+    Transforma o termo digitado em uma consulta FTS5 segura: cada palavra
+    vira um prefixo entre aspas e todas precisam aparecer.
+
+    >>> build_match_query('Pão de "queijo"')
+    '"Pão"* "de"* "queijo"*'
+    """
+    words = re.findall(r'\w+', search_term)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def index_recipe(recipe):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [recipe.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} '
+            '(rowid, title, description, preparation_steps) '
+            'VALUES (%s, %s, %s, %s)',
+            [
+                recipe.pk,
+                recipe.title,
+                recipe.description,
+                recipe.preparation_steps,
+            ]
+        )
+
+
+def remove_recipe(recipe_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [recipe_id]
+        )
+
+
+def rebuild_index():
+    from .models import Recipe
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} '
+            '(rowid, title, description, preparation_steps) '
+            'SELECT id, title, description, preparation_steps '
+            f'FROM {Recipe._meta.db_table}'
+        )
+        cursor.execute(f'SELECT count(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def search(queryset, search_term):
+    """
+    Filtra o queryset pelas receitas que casam com o termo e anota
+    search_rank (bm25, menor e mais relevante).
+    """
+    match_query = build_match_query(search_term)
+
+    if not match_query:
+        return queryset.none()
+
+    table = queryset.model._meta.db_table
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+
+    return queryset.filter(
+        id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match_query,),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            (match_query,),
+        )
+    ).order_by('search_rank', 'id')
@@ -0,0 +1,224 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from jobs.queue import enqueue
+
+from . import images, prefix_index, search_index, tasks
+from .caching import (GLOBAL_SCOPE, RELATED_SCOPE, adjust_recipe_counts,
+                      author_count_key, bump_versions, category_scopes,
+                      published_count_deltas, recipe_scopes)
+from .models import Category, Recipe
+
+
+def _bump_now_and_on_commit(scopes):
+    # Agora para este processo e de novo depois do commit, descartando
+    # paginas que outra requisicao tenha guardado antes do commit
+    bump_versions(scopes)
+    transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def _count_state(recipe):
+    return (recipe.is_published, recipe.category_id)
+
+
+@receiver(pre_save, sender=Recipe)
+def remember_previous_state(sender, instance, raw, **kwargs):
+    instance._previous_state = None
+    instance._previous_author_id = None
+
+    if raw or instance.pk is None:
+        return
+
+    previous = Recipe.objects.filter(
+        pk=instance.pk,
+    ).values_list('is_published', 'category_id', 'author_id').first()
+
+    if previous is not None:
+        instance._previous_state = previous[:2]
+        instance._previous_author_id = previous[2]
+
+
+@receiver(post_save, sender=Recipe)
+def update_counts_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+
+    previous_state = getattr(instance, '_previous_state', None)
+    current_state = _count_state(instance)
+
+    transaction.on_commit(
+        lambda: adjust_recipe_counts(previous_state, current_state)
+    )
+
+
+@receiver(post_delete, sender=Recipe)
+def update_counts_on_delete(sender, instance, **kwargs):
+    previous_state = _count_state(instance)
+
+    transaction.on_commit(
+        lambda: adjust_recipe_counts(previous_state, None)
+    )
+
+
+def _update_published_counts(previous_state, current_state):
+    # UPDATE ... SET published_count = published_count + delta, na mesma
+    # transacao do save: sem ler o valor antes, sem corrida entre processos
+    deltas = published_count_deltas(previous_state, current_state)
+
+    for category_id, delta in deltas.items():
+        # Uma contagem ja desviada nao fica negativa (e nao quebra o save);
+        # reconcile_category_counts acerta depois
+        Category.objects.filter(
+            pk=category_id, published_count__gte=-delta,
+        ).update(published_count=F('published_count') + delta)
+
+
+@receiver(post_save, sender=Recipe)
+def update_published_counts_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+
+    _update_published_counts(
+        getattr(instance, '_previous_state', None), _count_state(instance),
+    )
+
+
+@receiver(post_delete, sender=Recipe)
+def update_published_counts_on_delete(sender, instance, **kwargs):
+    _update_published_counts(_count_state(instance), None)
+
+
+def _forget_author_counts(author_ids):
+    keys = [
+        author_count_key(author_id)
+        for author_id in author_ids if author_id is not None
+    ]
+    if not keys:
+        return
+
+    # Como nas versoes: agora e de novo depois do commit
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(post_save, sender=Recipe)
+def forget_author_counts_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+
+    _forget_author_counts({
+        getattr(instance, '_previous_author_id', None), instance.author_id,
+    })
+
+
+@receiver(post_delete, sender=Recipe)
+def forget_author_counts_on_delete(sender, instance, **kwargs):
+    _forget_author_counts({instance.author_id})
+
+
+@receiver(post_save, sender=Recipe)
+def update_search_index_on_save(sender, instance, raw, **kwargs):
+    if search_index.is_enabled():
+        search_index.index_recipe(instance)
+
+
+@receiver(post_delete, sender=Recipe)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    if search_index.is_enabled():
+        search_index.remove_recipe(instance.pk)
+
+
+@receiver(post_save, sender=Recipe)
+def update_autocomplete_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+
+    # Indice em memoria: so depois do commit, para um rollback nao vazar
+    transaction.on_commit(lambda: prefix_index.update_recipe(instance))
+
+
+@receiver(post_delete, sender=Recipe)
+def update_autocomplete_on_delete(sender, instance, **kwargs):
+    recipe_id = instance.pk
+    transaction.on_commit(lambda: prefix_index.remove_recipe(recipe_id))
+
+
+@receiver(post_save, sender=Recipe)
+def enqueue_cover_variants_on_save(sender, instance, raw, **kwargs):
+    if raw or 'cover' in instance.get_deferred_fields():
+        return
+
+    if not images.variants_are_current(instance):
+        enqueue(tasks.generate_cover_variants, instance.pk)
+
+
+@receiver(post_save, sender=Recipe)
+def bump_page_versions_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+
+    _bump_now_and_on_commit(recipe_scopes(
+        instance.pk,
+        getattr(instance, '_previous_state', None),
+        _count_state(instance),
+    ))
+
+
+@receiver(post_delete, sender=Recipe)
+def bump_page_versions_on_delete(sender, instance, **kwargs):
+    _bump_now_and_on_commit(
+        recipe_scopes(instance.pk, _count_state(instance), None)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_page_versions(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+
+    _bump_now_and_on_commit(category_scopes(instance.pk))
+
+
+# Campos do autor exibidos nos cards das receitas
+AUTHOR_PAGE_FIELDS = ('first_name', 'last_name', 'username')
+
+
+def _skips_author_page_fields(update_fields):
+    # Login (last_login), troca de senha e afins nao aparecem nas paginas
+    return update_fields is not None and update_fields.isdisjoint(
+        AUTHOR_PAGE_FIELDS
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_author_fields(sender, instance, raw, update_fields,
+                                    **kwargs):
+    instance._previous_page_fields = None
+
+    if raw or instance.pk is None or _skips_author_page_fields(update_fields):
+        return
+
+    instance._previous_page_fields = User.objects.filter(
+        pk=instance.pk,
+    ).values_list(*AUTHOR_PAGE_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def bump_page_versions_on_author_change(sender, instance, created,
+                                        update_fields, raw, **kwargs):
+    # Um usuario novo ainda nao tem receitas publicadas
+    if raw or created or _skips_author_page_fields(update_fields):
+        return
+
+    previous = getattr(instance, '_previous_page_fields', None)
+    current = tuple(getattr(instance, field) for field in AUTHOR_PAGE_FIELDS)
+    if previous is None or previous == current:
+        return
+
+    if Recipe.objects.published().filter(author_id=instance.pk).exists():
+        _bump_now_and_on_commit({GLOBAL_SCOPE, RELATED_SCOPE})
@@ -0,0 +1,14 @@
+from . import images
+from .caching import bump_versions, recipe_scopes
+from .models import Recipe
+
+
+def generate_cover_variants(recipe_id):
+    recipe = Recipe.objects.filter(pk=recipe_id).first()
+
+    if recipe is None or not images.update_cover_variants(recipe):
+        return
+
+    # update_cover_variants grava com update(), sem sinais
+    state = (recipe.is_published, recipe.category_id)
+    bump_versions(recipe_scopes(recipe.pk, state, state))
@@ -0,0 +1,14 @@
+from django import template
+
+from recipes.caching import category_nav as category_nav_snapshot
+
+register = template.Library()
+
+
+@register.inclusion_tag('recipes/partials/category-nav.html')
+def category_nav(current_category_id=None):
+    """Navegacao por categoria, com as contagens do snapshot em cache"""
+    return {
+        'categories': category_nav_snapshot(),
+        'current_category_id': current_category_id,
+    }
@@ -0,0 +1,66 @@
+import hashlib
+
+from django import template
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+CARD_TEMPLATE = 'recipes/partials/recipe.html'
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def card_cache_key(recipe, is_detail_page=False):
+    """
+    A chave muda sozinha quando a receita e salva (updated_at) ou quando o
+    autor ou a categoria exibidos no card mudam, entao nunca fica velha. O
+    card de detalhe tambem leva o modo de preparo renderizado, que o comando
+    render_preparation_steps regrava sem mexer em updated_at.
+    """
+    author = recipe.author
+    category = recipe.category
+    fingerprint = repr((
+        recipe.updated_at.isoformat() if recipe.updated_at else None,
+        author and (author.first_name, author.last_name, author.username),
+        category and (category.id, category.name),
+        is_detail_page and recipe.preparation_steps_rendered,
+    ))
+    digest = hashlib.md5(fingerprint.encode('utf-8')).hexdigest()
+    variant = 'detail' if is_detail_page else 'list'
+    return f'recipes:card:{variant}:{recipe.id}:{digest}'
+
+
+def render_cards(recipes, is_detail_page=False):
+    recipes = list(recipes)
+    keys = [card_cache_key(recipe, is_detail_page) for recipe in recipes]
+    cached_cards = cache.get_many(keys)
+    rendered_cards = {}
+    cards = []
+
+    for key, recipe in zip(keys, recipes):
+        card = cached_cards.get(key)
+
+        if card is None:
+            card = render_to_string(CARD_TEMPLATE, {
+                'recipe': recipe,
+                'is_detail_page': is_detail_page,
+            })
+            rendered_cards[key] = card
+
+        cards.append(mark_safe(card))
+
+    if rendered_cards:
+        cache.set_many(rendered_cards, CARD_CACHE_TIMEOUT)
+
+    return cards
+
+
+@register.simple_tag
+def recipe_cards(recipes, is_detail_page=False):
+    return render_cards(recipes, is_detail_page)
+
+
+@register.simple_tag
+def recipe_card(recipe, is_detail_page=False):
+    return render_cards([recipe], is_detail_page)[0]
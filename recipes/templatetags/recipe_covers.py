@@ -0,0 +1,46 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+LIST_SIZES = '(max-width: 640px) 100vw, 320px'
+DETAIL_SIZES = '(max-width: 1280px) 100vw, 1280px'
+
+
+def _srcset(variants):
+    return ', '.join(
+        f'{default_storage.url(name)} {width}w' for width, name in variants
+    )
+
+
+@register.simple_tag
+def cover_picture(recipe, alt='', is_detail_page=False):
+    """
+    <picture> com srcset em WebP e JPEG; sem variantes usa a capa original.
+    """
+    variants = recipe.cover_variants or {}
+
+    if not variants.get('jpeg'):
+        return format_html('<img src="{}" alt="{}">', recipe.cover.url, alt)
+
+    sizes = DETAIL_SIZES if is_detail_page else LIST_SIZES
+    largest_jpeg = variants['jpeg'][-1][1]
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (f'image/{extension}', _srcset(variants[extension]), sizes)
+            for extension in ('webp',) if variants.get(extension)
+        )
+    )
+
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" '
+        'loading="lazy"></picture>',
+        sources,
+        default_storage.url(largest_jpeg),
+        _srcset(variants['jpeg']),
+        sizes,
+        alt,
+    )
@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import resolve, reverse
+
+from recipes import async_views
+from recipes.caching import RELATED_SCOPE, bump_versions, category_nav
+from utils.pagination import encode_cursor
+
+from .test_recipe_base import RecipeTestBase
+
+
+@override_settings(ROOT_URLCONF='project.urls_async')
+class RecipeAsyncViewsTest(RecipeTestBase):
+    def test_async_urls_use_async_views(self):
+        self.assertIs(resolve(reverse('recipes:home')).func, async_views.home)
+        self.assertIs(
+            resolve(reverse('recipes:recipe', kwargs={'id': 1})).func,
+            async_views.recipe,
+        )
+
+    async def test_async_home_lists_published_recipes(self):
+        await sync_to_async(self.make_recipe)(title='Receita async')
+        await sync_to_async(self.make_recipe)(
+            title='Rascunho', slug='rascunho', is_published=False,
+            author_data={'username': 'outro'},
+        )
+
+        response = await self.async_client.get(reverse('recipes:home'))
+        content = response.content.decode('utf-8')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Receita async', content)
+        self.assertNotIn('Rascunho', content)
+        self.assertIn('public', response['Cache-Control'])
+
+    @patch('recipes.views.PER_PAGE', new=2)
+    async def test_async_home_is_paginated(self):
+        for i in range(5):
+            await sync_to_async(self.make_recipe)(
+                slug=f'r{i}', author_data={'username': f'u{i}'}
+            )
+
+        response = await self.async_client.get(reverse('recipes:home'))
+
+        self.assertEqual(len(response.context['recipes']), 2)
+        self.assertEqual(response.context['recipes'].paginator.num_pages, 3)
+
+    async def test_async_home_falls_back_to_first_page_on_bad_cursor(self):
+        await sync_to_async(self.make_recipe)()
+
+        for token in (encode_cursor([{'a': 1}]), 'e30'):
+            response = await self.async_client.get(
+                reverse('recipes:home') + f'?cursor={token}'
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['recipes']), 1)
+
+    async def test_async_category_returns_404_for_empty_category(self):
+        response = await self.async_client.get(
+            reverse('recipes:category', kwargs={'category_id': 1000})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_recipe_detail_and_conditional_response(self):
+        recipe = await sync_to_async(self.make_recipe)(
+            preparation_steps='Misture tudo'
+        )
+        url = reverse('recipes:recipe', kwargs={'id': recipe.id})
+
+        response = await self.async_client.get(url)
+        self.assertIn('Misture tudo', response.content.decode('utf-8'))
+
+        response = await self.async_client.get(
+            url, headers={'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_async_render_queries_the_database_outside_the_loop(self):
+        recipe = await sync_to_async(self.make_recipe)()
+
+        def bumped_category_nav():
+            # Outro processo muda uma categoria durante a renderizacao
+            bump_versions([RELATED_SCOPE])
+            return category_nav()
+
+        with patch(
+            'recipes.templatetags.category_nav.category_nav_snapshot',
+            side_effect=bumped_category_nav,
+        ):
+            response = await self.async_client.get(
+                reverse('recipes:recipe', kwargs={'id': recipe.id})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(recipe.category.name, response.content.decode('utf-8'))
+
+    async def test_async_recipe_detail_returns_404_if_not_published(self):
+        recipe = await sync_to_async(self.make_recipe)(is_published=False)
+        response = await self.async_client.get(
+            reverse('recipes:recipe', kwargs={'id': recipe.id})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_search_finds_recipe(self):
+        await sync_to_async(self.make_recipe)(title='Pão de queijo')
+
+        response = await self.async_client.get(
+            reverse('recipes:search') + '?q=pao'
+        )
+        self.assertIn('Pão de queijo', response.content.decode('utf-8'))
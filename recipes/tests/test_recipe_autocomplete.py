@@ -0,0 +1,145 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes import prefix_index
+from recipes.prefix_index import PrefixIndex
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeAutocompleteTest(RecipeTestBase):
+    def make_titles(self, *titles):
+        recipes = []
+        for i, title in enumerate(titles):
+            recipes.append(self.make_recipe(
+                title=title, slug=f'recipe-{i}',
+                author_data={'username': f'u{i}'},
+            ))
+        return recipes
+
+    def suggest(self, term):
+        response = self.client.get(
+            reverse('recipes:autocomplete') + f'?q={term}'
+        )
+        return [item['title'] for item in response.json()['suggestions']]
+
+    def test_autocomplete_matches_the_start_of_any_word(self):
+        self.make_titles('Pão de queijo', 'Bolo de milho', 'Queijadinha')
+
+        self.assertEqual(
+            sorted(self.suggest('quei')), ['Pão de queijo', 'Queijadinha'],
+        )
+        self.assertEqual(self.suggest('PAO'), ['Pão de queijo'])
+        self.assertEqual(self.suggest('xyz'), [])
+
+    def test_autocomplete_ranks_by_recency(self):
+        old, new = self.make_titles('Bolo antigo', 'Bolo novo')
+        type(old).objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=10),
+        )
+
+        self.assertEqual(self.suggest('bolo'), ['Bolo novo', 'Bolo antigo'])
+
+    def test_autocomplete_requires_the_previous_words(self):
+        self.make_titles('Bolo de milho', 'Bolo de cenoura', 'Milho cozido')
+
+        self.assertEqual(self.suggest('bolo mi'), ['Bolo de milho'])
+
+    def test_autocomplete_returns_recipe_urls_without_queries(self):
+        [recipe] = self.make_titles('Bolo de milho')
+        prefix_index.get_index()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('recipes:autocomplete') + '?q=bol'
+            )
+
+        [suggestion] = response.json()['suggestions']
+        self.assertEqual(
+            suggestion['url'],
+            reverse('recipes:recipe', kwargs={'id': recipe.id}),
+        )
+        self.assertIn('public', response['Cache-Control'])
+
+    def assert_not_rebuilt(self):
+        return patch.object(
+            PrefixIndex, 'build', side_effect=AssertionError('rebuild'),
+        )
+
+    def test_index_is_updated_incrementally_from_signals(self):
+        [recipe] = self.make_titles('Bolo de milho')
+        self.assertEqual(self.suggest('bolo'), ['Bolo de milho'])
+        self.enterContext(self.assert_not_rebuilt())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.title = 'Torta de milho'
+            recipe.save()
+        self.assertEqual(self.suggest('bolo'), [])
+        self.assertEqual(self.suggest('tor'), ['Torta de milho'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.is_published = False
+            recipe.save()
+        self.assertEqual(self.suggest('tor'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_recipe(
+                title='Torta salgada', slug='torta-salgada',
+                author_data={'username': 'other'},
+            )
+        self.assertEqual(self.suggest('to'), ['Torta salgada'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            type(recipe).objects.filter(title='Torta salgada').delete()
+        self.assertEqual(self.suggest('to'), [])
+
+    def test_index_follows_changes_logged_by_other_processes(self):
+        [recipe, other] = self.make_titles('Bolo de milho', 'Pudim')
+        self.assertEqual(self.suggest('bolo'), ['Bolo de milho'])
+        self.enterContext(self.assert_not_rebuilt())
+
+        # Outro processo salvou sem passar pelos sinais deste
+        type(recipe).objects.filter(pk=recipe.pk).update(title='Torta')
+        type(other).objects.filter(pk=other.pk).delete()
+        prefix_index.log_change(recipe.id)
+        prefix_index.log_change(other.id)
+
+        with self.assertNumQueries(1):
+            prefix_index.get_index()
+        self.assertEqual(self.suggest('bolo'), [])
+        self.assertEqual(self.suggest('tor'), ['Torta'])
+        self.assertEqual(self.suggest('pud'), [])
+
+    def test_expired_change_log_rebuilds_the_index(self):
+        self.make_titles('Bolo de milho')
+        old = prefix_index.get_index()
+
+        position = prefix_index.log_change(0)
+        prefix_index._change_cache().delete(prefix_index.change_key(position))
+
+        self.assertIsNot(prefix_index.get_index(), old)
+
+    def test_prefix_lookup_bisects_both_ends_of_the_vocabulary(self):
+        index = PrefixIndex()
+        index.vocabulary = [f'w{number:06d}' for number in range(200_000)]
+        index.vocabulary += ['zyx', 'zyxw', 'zz']
+
+        class NotIterable(list):
+            def __iter__(self):
+                raise AssertionError('percorreu o vocabulario')
+
+        index.vocabulary = NotIterable(index.vocabulary)
+
+        self.assertEqual(index.words_with_prefix('zyx'), ['zyx', 'zyxw'])
+        self.assertEqual(index.words_with_prefix('w19999'), [
+            f'w19999{digit}' for digit in range(10)
+        ])
+        self.assertEqual(index.words_with_prefix('zzzz'), [])
+
+    def test_unpublished_recipes_are_not_suggested(self):
+        self.make_recipe(title='Bolo secreto', is_published=False)
+
+        self.assertEqual(self.suggest('bolo'), [])
@@ -1,10 +1,16 @@
+from django.core.cache import cache
 from django.test import TestCase
 
+from project import ratelimit
+from recipes import prefix_index
 from recipes.models import Category, Recipe, User
 
 
 class RecipeTestBase(TestCase):
     def setUp(self) -> None:
+        cache.clear()
+        prefix_index.reset_index()
+        ratelimit.reset_store()
         return super().setUp()
 
     def make_category(self, name='Category'):
@@ -14,7 +20,11 @@ class RecipeTestBase(TestCase):
     
     def make_author(self, first_name='user', last_name='name',
                     username='username', password='123456',
-                    email='username@gmail.com'):
+                    email=None):
+        # Email unico sem diferenciar maiusculas: um por usuario
+        if email is None:
+            email = f'{username}@gmail.com'
+
         return User.objects.create_user(
             first_name=first_name,
             last_name=last_name,
@@ -0,0 +1,67 @@
+from django.urls import reverse
+
+from recipes.templatetags.recipe_cards import card_cache_key
+
+from .test_recipe_base import RecipeTestBase
+
+CARD_TEMPLATE = 'recipes/partials/recipe.html'
+
+
+class RecipeCardCacheTest(RecipeTestBase):
+    def test_recipe_home_reuses_cached_cards(self):
+        self.make_recipe()
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertTemplateUsed(response, CARD_TEMPLATE)
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertTemplateNotUsed(response, CARD_TEMPLATE)
+        self.assertIn('title', response.content.decode('utf-8'))
+
+    def test_recipe_card_key_differs_between_list_and_detail(self):
+        recipe = self.make_recipe()
+        self.assertNotEqual(
+            card_cache_key(recipe, is_detail_page=False),
+            card_cache_key(recipe, is_detail_page=True),
+        )
+
+    def test_recipe_detail_uses_detail_card_variant(self):
+        recipe = self.make_recipe(preparation_steps='Passo secreto')
+        self.client.get(reverse('recipes:home'))
+
+        response = self.client.get(
+            reverse('recipes:recipe', kwargs={'id': recipe.id})
+        )
+        self.assertIn('Passo secreto', response.content.decode('utf-8'))
+
+    def test_recipe_card_is_rendered_again_when_category_changes(self):
+        recipe = self.make_recipe(category_data={'name': 'Doces'})
+        self.client.get(reverse('recipes:home'))
+
+        recipe.category.name = 'Sobremesas'
+        recipe.category.save()
+
+        content = self.client.get(reverse('recipes:home')).content.decode()
+        self.assertIn('Sobremesas', content)
+        self.assertNotIn('Doces', content)
+
+    def test_recipe_card_is_rendered_again_when_author_changes(self):
+        recipe = self.make_recipe(author_data={'first_name': 'Ana'})
+        self.client.get(reverse('recipes:home'))
+
+        recipe.author.first_name = 'Beatriz'
+        recipe.author.save()
+
+        content = self.client.get(reverse('recipes:home')).content.decode()
+        self.assertIn('Beatriz', content)
+        self.assertNotIn('Ana', content)
+
+    def test_recipe_card_is_rendered_again_when_recipe_is_saved(self):
+        recipe = self.make_recipe(title='Titulo antigo')
+        self.client.get(reverse('recipes:home'))
+
+        recipe.title = 'Titulo novo'
+        recipe.save()
+
+        content = self.client.get(reverse('recipes:home')).content.decode()
+        self.assertIn('Titulo novo', content)
@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from recipes.caching import category_nav
+from recipes.models import Category
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeCategoryNavTest(RecipeTestBase):
+    def test_nav_lists_categories_with_published_recipes(self):
+        recipe = self.make_recipe(category_data={'name': 'Doces'})
+        self.make_category(name='Vazia')
+
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertContains(response, 'category-nav')
+        self.assertContains(
+            response,
+            reverse('recipes:category', kwargs={'category_id': recipe.category.id}),
+        )
+        self.assertNotContains(response, 'Vazia')
+        self.assertEqual(
+            category_nav(),
+            [{'id': recipe.category.id, 'name': 'Doces', 'published_count': 1}],
+        )
+
+    def test_nav_snapshot_is_cached(self):
+        self.make_recipe()
+        category_nav()
+
+        with self.assertNumQueries(0):
+            category_nav()
+
+    def test_publishing_refreshes_nav_on_cached_pages_of_other_categories(self):
+        recipe = self.make_recipe(category_data={'name': 'Doces'})
+        draft = self.make_recipe(
+            slug='draft', is_published=False,
+            category_data={'name': 'Salgados'}, author_data={'username': 'b'},
+        )
+        url = reverse('recipes:category', kwargs={'category_id': recipe.category.id})
+        self.assertNotContains(self.client.get(url), 'Salgados')
+
+        draft.is_published = True
+        draft.save()
+
+        self.assertContains(self.client.get(url), 'Salgados')
+
+    def test_reconcile_category_counts_fixes_drift(self):
+        recipe = self.make_recipe()
+        Category.objects.update(published_count=7)
+        out = StringIO()
+
+        call_command('reconcile_category_counts', '--dry-run', stdout=out)
+        recipe.category.refresh_from_db()
+        self.assertEqual(recipe.category.published_count, 7)
+        self.assertIn('7 -> 1', out.getvalue())
+
+        call_command('reconcile_category_counts', stdout=StringIO())
+        recipe.category.refresh_from_db()
+        self.assertEqual(recipe.category.published_count, 1)
+
+    def test_reconcile_refreshes_the_nav_snapshot(self):
+        self.make_recipe()
+        Category.objects.update(published_count=0)
+        self.assertEqual(category_nav(), [])
+
+        call_command('reconcile_category_counts', stdout=StringIO())
+
+        self.assertEqual(len(category_nav()), 1)
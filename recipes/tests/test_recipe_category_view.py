@@ -1,6 +1,12 @@
+import tracemalloc
+from unittest.mock import patch
+
+from django.db.models.signals import post_init
 from django.urls import resolve, reverse
 
 from recipes import views
+from recipes.caching import category_nav
+from recipes.models import Category, Recipe
 
 from .test_recipe_base import RecipeTestBase
 
@@ -50,4 +56,62 @@ class RecipeCategoryViewTest(RecipeTestBase):
         )
         content = response.content.decode('utf-8')
 
-        self.assertIn(required_title, content)
\ No newline at end of file
+        self.assertIn(required_title, content)
+
+    def make_big_category(self, size):
+        recipe = self.make_recipe()
+        Recipe.objects.bulk_create([
+            Recipe(
+                title=f'Receita {i}', description='description',
+                slug=f'receita-{i}', preparation_time=10,
+                preparation_time_unit='Minutos', servings=3,
+                servings_unit='Porcoes', preparation_steps='x' * 2000,
+                is_published=True, category=recipe.category,
+                author=recipe.author,
+            )
+            for i in range(size)
+        ])
+        # bulk_create nao passa pelos sinais que mantem a contagem
+        Category.objects.filter(pk=recipe.category.pk).update(
+            published_count=size + 1,
+        )
+        return recipe.category
+
+    @patch('recipes.views.PER_PAGE', new=9)
+    def test_recipe_category_loads_only_one_page_of_recipes(self):
+        category = self.make_big_category(1000)
+        url = reverse('recipes:category', kwargs={'category_id': category.id})
+        loaded = []
+
+        def count_instances(sender, instance, **kwargs):
+            loaded.append(instance)
+
+        post_init.connect(count_instances, sender=Recipe)
+        self.addCleanup(post_init.disconnect, count_instances, sender=Recipe)
+
+        # Aggregate do ETag e a fatia da pagina; nome e total da categoria
+        # vem do snapshot da navegacao
+        category_nav()
+        tracemalloc.start()
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(loaded), 9)
+        self.assertIn(category.name, response.context['title'])
+        # Materializar as 1000 receitas passaria de 4 MB
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+    def test_recipe_category_empty_returns_404_without_querying_recipes(self):
+        empty = self.make_category(name='Vazia')
+        category_nav()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('recipes:category', kwargs={'category_id': empty.id})
+            )
+
+        self.assertEqual(response.status_code, 404)
+
@@ -0,0 +1,122 @@
+import time
+from unittest.mock import patch
+
+from django.urls import reverse
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeConditionalResponseTest(RecipeTestBase):
+    def test_recipe_home_sends_validators_and_public_cache_control(self):
+        self.make_recipe()
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_recipe_home_returns_304_without_rendering(self):
+        self.make_recipe()
+        etag = self.client.get(reverse('recipes:home'))['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('recipes:home'), HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertTemplateNotUsed(response, 'recipes/pages/home.html')
+
+    def test_recipe_home_etag_changes_when_a_recipe_is_published(self):
+        recipe = self.make_recipe(is_published=False)
+        etag = self.client.get(reverse('recipes:home'))['ETag']
+
+        recipe.is_published = True
+        recipe.save()
+
+        response = self.client.get(
+            reverse('recipes:home'), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_recipe_detail_returns_304_when_not_modified(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', kwargs={'id': recipe.id})
+        first = self.client.get(url)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def later(self):
+        # Last-Modified tem resolucao de segundos: a mudanca acontece "depois"
+        later_ns = time.time_ns() + 5 * 10 ** 9
+        return patch('recipes.caching.time.time_ns', return_value=later_ns)
+
+    def test_recipe_home_if_modified_since_sees_an_older_recipe_deleted(self):
+        older = self.make_recipe(slug='antiga', author_data={'username': 'a'})
+        self.make_recipe(slug='nova', author_data={'username': 'b'})
+        first = self.client.get(reverse('recipes:home'))
+
+        with self.later():
+            older.delete()
+
+        response = self.client.get(
+            reverse('recipes:home'),
+            HTTP_IF_MODIFIED_SINCE=first['Last-Modified'],
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_recipe_detail_if_modified_since_sees_an_author_rename(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', kwargs={'id': recipe.id})
+        first = self.client.get(url)
+
+        with self.later():
+            recipe.author.first_name = 'Renomeado'
+            recipe.author.save()
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Renomeado', response.content.decode('utf-8'))
+
+    def test_recipe_detail_etag_changes_when_recipe_is_saved(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', kwargs={'id': recipe.id})
+        etag = self.client.get(url)['ETag']
+
+        recipe.title = 'Outro titulo'
+        recipe.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Outro titulo', response.content.decode('utf-8'))
+
+    def test_recipe_category_etag_changes_when_category_is_renamed(self):
+        recipe = self.make_recipe()
+        url = reverse(
+            'recipes:category', kwargs={'category_id': recipe.category.id}
+        )
+        etag = self.client.get(url)['ETag']
+
+        recipe.category.name = 'Renomeada'
+        recipe.category.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_authenticated_users_get_private_responses(self):
+        self.make_recipe()
+        self.make_author(username='leitor', password='Senha123')
+        self.client.login(username='leitor', password='Senha123')
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
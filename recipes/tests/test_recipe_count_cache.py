@@ -0,0 +1,84 @@
+from django.core.cache import cache
+from django.urls import reverse
+
+from recipes.caching import PUBLISHED_COUNT_KEY
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeCountCacheTest(RecipeTestBase):
+    def test_recipe_home_count_is_cached_between_requests(self):
+        self.make_recipe()
+        self.client.get(reverse('recipes:home'))
+
+        # Outra URL para nao cair no cache da pagina inteira: apenas o
+        # SELECT da pagina, o COUNT vem do cache
+        with self.assertNumQueries(1):
+            self.client.get(reverse('recipes:home') + '?page=1')
+
+        self.assertEqual(cache.get(PUBLISHED_COUNT_KEY), 1)
+
+    def published_count(self, category):
+        category.refresh_from_db(fields=['published_count'])
+        return category.published_count
+
+    def test_recipe_publish_and_unpublish_update_counts(self):
+        recipe = self.make_recipe(is_published=False)
+        cache.set(PUBLISHED_COUNT_KEY, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.is_published = True
+            recipe.save()
+
+        self.assertEqual(cache.get(PUBLISHED_COUNT_KEY), 1)
+        self.assertEqual(self.published_count(recipe.category), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.is_published = False
+            recipe.save()
+
+        self.assertEqual(cache.get(PUBLISHED_COUNT_KEY), 0)
+        self.assertEqual(self.published_count(recipe.category), 0)
+
+    def test_recipe_category_change_moves_published_count(self):
+        recipe = self.make_recipe()
+        old_category = recipe.category
+        new_category = self.make_category(name='Nova')
+        cache.set(PUBLISHED_COUNT_KEY, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.category = new_category
+            recipe.save()
+
+        self.assertEqual(cache.get(PUBLISHED_COUNT_KEY), 1)
+        self.assertEqual(self.published_count(old_category), 0)
+        self.assertEqual(self.published_count(new_category), 1)
+
+    def test_recipe_delete_decrements_counts(self):
+        recipe = self.make_recipe()
+        cache.set(PUBLISHED_COUNT_KEY, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.delete()
+
+        self.assertEqual(cache.get(PUBLISHED_COUNT_KEY), 0)
+        self.assertEqual(self.published_count(recipe.category), 0)
+
+    def test_saving_a_category_keeps_its_published_count(self):
+        recipe = self.make_recipe()
+        stale_category = type(recipe.category).objects.get()
+        # Outra receita publicada depois que a categoria foi carregada
+        type(stale_category).objects.filter(pk=stale_category.pk).update(
+            published_count=2,
+        )
+
+        stale_category.name = 'Renomeada'
+        stale_category.save()
+
+        self.assertEqual(self.published_count(stale_category), 2)
+
+    def test_missing_count_is_not_created_by_signals(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_recipe()
+
+        self.assertIsNone(cache.get(PUBLISHED_COUNT_KEY))
@@ -0,0 +1,99 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+
+from jobs.queue import run_due_jobs
+from recipes.models import Recipe
+
+from .test_recipe_base import RecipeTestBase
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image_file(name='capa.png', size=(1600, 900)):
+    buffer = BytesIO()
+    Image.new('RGBA', size, (200, 100, 50, 255)).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeCoverVariantsTest(RecipeTestBase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def save_cover(self, recipe, image_file):
+        recipe.cover = image_file
+        recipe.save()
+        run_due_jobs()
+        recipe.refresh_from_db()
+
+    def test_saving_a_cover_only_enqueues_the_resize(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_image_file()
+        recipe.save()
+
+        recipe.refresh_from_db()
+        self.assertEqual({}, recipe.cover_variants)
+        self.assertEqual(1, len(run_due_jobs()))
+
+    def test_saving_a_cover_generates_webp_and_jpeg_variants(self):
+        recipe = self.make_recipe()
+        self.save_cover(recipe, make_image_file())
+        variants = recipe.cover_variants
+
+        self.assertEqual(variants['source'], recipe.cover.name)
+        self.assertEqual([320, 640, 1280], [w for w, _ in variants['webp']])
+        self.assertEqual([320, 640, 1280], [w for w, _ in variants['jpeg']])
+
+        with default_storage.open(variants['webp'][0][1]) as variant:
+            image = Image.open(variant)
+            self.assertEqual(('WEBP', 320, 180), (image.format, *image.size))
+
+    def test_small_covers_are_not_upscaled(self):
+        recipe = self.make_recipe()
+        self.save_cover(recipe, make_image_file(size=(500, 250)))
+
+        widths = [w for w, _ in recipe.cover_variants['jpeg']]
+        self.assertEqual([320, 500], widths)
+
+    def test_replacing_the_cover_removes_old_variants(self):
+        recipe = self.make_recipe()
+        self.save_cover(recipe, make_image_file())
+        old_variant = recipe.cover_variants['jpeg'][0][1]
+
+        self.save_cover(recipe, make_image_file(name='nova.png'))
+
+        self.assertFalse(default_storage.exists(old_variant))
+        self.assertIn('nova', recipe.cover_variants['jpeg'][0][1])
+
+    def test_recipe_card_emits_srcset_and_sizes(self):
+        recipe = self.make_recipe()
+        self.save_cover(recipe, make_image_file())
+
+        content = self.client.get(reverse('recipes:home')).content.decode()
+
+        self.assertIn('<source type="image/webp" srcset="', content)
+        self.assertIn('-320.webp 320w', content)
+        self.assertIn('-1280.jpeg 1280w', content)
+        self.assertIn('sizes="(max-width: 640px) 100vw, 320px"', content)
+
+    def test_generate_cover_variants_command_backfills_existing_covers(self):
+        recipe = self.make_recipe()
+        self.save_cover(recipe, make_image_file())
+        Recipe.objects.filter(pk=recipe.pk).update(cover_variants={})
+
+        stdout = StringIO()
+        call_command('generate_cover_variants', stdout=stdout)
+
+        recipe.refresh_from_db()
+        self.assertEqual(len(recipe.cover_variants['webp']), 3)
+        self.assertIn('1 capa(s)', stdout.getvalue())
@@ -1,6 +1,7 @@
 from django.urls import resolve, reverse
 
 from recipes import views
+from recipes.caching import category_nav
 
 from .test_recipe_base import RecipeTestBase
 
@@ -54,4 +55,16 @@ class RecipeDetailViewTest(RecipeTestBase):
             reverse('recipes:recipe', kwargs={'id': recipe.id})
         )
 
-        self.assertEqual(response.status_code, 404)
\ No newline at end of file
+        self.assertEqual(response.status_code, 404)
+
+    def test_recipe_detail_loads_author_and_category_with_the_recipe(self):
+        recipe = self.make_recipe()
+        category_nav()
+
+        # Validadores do ETag e a receita com autor e categoria
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('recipes:recipe', kwargs={'id': recipe.id})
+            )
+
+        self.assertContains(response, recipe.author.first_name)
@@ -1,8 +1,13 @@
+import base64
+import json
 from unittest.mock import patch
 
 from django.urls import resolve, reverse
+from parameterized import parameterized
 
 from recipes import views
+from recipes.caching import category_nav
+from utils.pagination import encode_cursor
 
 from .test_recipe_base import RecipeTestBase
 
@@ -71,4 +76,91 @@ class RecipeHomeViewTest(RecipeTestBase):
             response.context['recipes'].number,
             1
         )
-        
\ No newline at end of file
+        
+    def test_recipe_home_does_not_make_one_query_per_recipe(self):
+        for i in range(5):
+            self.make_recipe(
+                slug=f'r{i}',
+                author_data={'username': f'u{i}'},
+                category_data={'name': f'c{i}'},
+            )
+
+        # Um COUNT (validadores do ETag, reaproveitado pelo paginador) e
+        # um SELECT com author e category; a navegacao de categorias e um
+        # snapshot compartilhado por todas as paginas
+        category_nav()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('recipes:home'))
+
+        self.assertIn('c4', response.content.decode('utf-8'))
+
+    def test_recipe_home_does_not_load_preparation_steps(self):
+        self.make_recipe()
+        response = self.client.get(reverse('recipes:home'))
+        recipe = response.context['recipes'][0]
+
+        self.assertIn('preparation_steps', recipe.get_deferred_fields())
+
+    @patch('recipes.views.PER_PAGE', new=3)
+    @patch('utils.pagination.PAGE_NUMBER_LIMIT', new=2)
+    def test_recipe_home_switches_to_cursor_after_page_number_limit(self):
+        recipes = [
+            self.make_recipe(slug=f'r{i}', author_data={'username': f'u{i}'})
+            for i in range(8)
+        ]
+        recipes.reverse()
+
+        response = self.client.get(reverse('recipes:home') + '?page=50')
+        self.assertEqual(response.context['recipes'].number, 2)
+        next_cursor = response.context['pagination_range']['next_cursor']
+        self.assertIsNotNone(next_cursor)
+
+        response = self.client.get(
+            reverse('recipes:home') + f'?cursor={next_cursor}'
+        )
+        page = response.context['recipes']
+        self.assertEqual(list(page), recipes[6:])
+        self.assertFalse(page.has_next())
+        self.assertIn(
+            f'?cursor={response.context["pagination_range"]["previous_cursor"]}',
+            response.content.decode('utf-8')
+        )
+
+        previous_cursor = response.context['pagination_range']['previous_cursor']
+        response = self.client.get(
+            reverse('recipes:home') + f'?cursor={previous_cursor}'
+        )
+        self.assertEqual(list(response.context['recipes']), recipes[3:6])
+
+    @parameterized.expand([
+        ('text', ['abc']),
+        ('object', [{'a': 1}]),
+        ('null', [None]),
+        ('overflow', [10 ** 400]),
+        ('too_many', [1, 2]),
+    ])
+    def test_recipe_home_falls_back_to_first_page_on_bad_cursor_values(
+            self, _name, values):
+        self.make_recipe()
+
+        response = self.client.get(
+            reverse('recipes:home') + f'?cursor={encode_cursor(values)}'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['recipes']), 1)
+
+    def test_recipe_home_ignores_tampered_cursor(self):
+        self.make_recipe()
+        # Token no formato antigo (JSON em base64, sem assinatura)
+        forged = base64.urlsafe_b64encode(
+            json.dumps({'v': [1e400], 'f': True}).encode('utf-8')
+        ).decode('ascii')
+        tampered = encode_cursor([1])[:-2] + 'xx'
+
+        for token in (forged, tampered):
+            response = self.client.get(
+                reverse('recipes:home') + f'?cursor={token}'
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['recipes']), 1)
@@ -0,0 +1,153 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from recipes.caching import GLOBAL_SCOPE, RELATED_SCOPE, get_versions
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipePageCacheTest(RecipeTestBase):
+    def test_recipe_home_is_served_from_cache_for_anonymous_users(self):
+        self.make_recipe()
+        first = self.client.get(reverse('recipes:home'))
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('recipes:home'))
+
+        self.assertEqual(first.content, second.content)
+
+    def test_recipe_pages_are_cached_per_query_string(self):
+        self.make_recipe()
+        self.client.get(reverse('recipes:home'))
+
+        response = self.client.get(reverse('recipes:home') + '?page=1A')
+        self.assertTemplateUsed(response, 'recipes/pages/home.html')
+
+    def test_publishing_a_recipe_invalidates_home(self):
+        recipe = self.make_recipe(title='Receita nova', is_published=False)
+        self.client.get(reverse('recipes:home'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.is_published = True
+            recipe.save()
+
+        content = self.client.get(reverse('recipes:home')).content.decode()
+        self.assertIn('Receita nova', content)
+
+    def test_bump_from_another_process_invalidates_this_process_pages(self):
+        self.make_recipe(title='Antes')
+        self.client.get(reverse('recipes:home'))
+
+        # Ex.: run_jobs ou um comando de manutencao; so as versoes sao
+        # compartilhadas, as paginas continuam no cache deste processo
+        subprocess.run(
+            [sys.executable, '-c', (
+                'import django; django.setup(); '
+                'from recipes.caching import GLOBAL_SCOPE, bump_versions; '
+                'bump_versions([GLOBAL_SCOPE])'
+            )],
+            check=True, cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'project.settings'},
+        )
+
+        with self.assertNumQueries(2):
+            self.client.get(reverse('recipes:home'))
+
+    def test_saving_a_draft_does_not_invalidate_home(self):
+        recipe = self.make_recipe(is_published=False)
+        version = get_versions([GLOBAL_SCOPE])
+
+        recipe.title = 'Rascunho'
+        recipe.save()
+
+        self.assertEqual(version, get_versions([GLOBAL_SCOPE]))
+
+    def test_registration_does_not_invalidate_pages(self):
+        self.make_recipe()
+        versions = get_versions([GLOBAL_SCOPE, RELATED_SCOPE])
+
+        self.client.post(reverse('authors:register_create'), {
+            'username': 'novousuario',
+            'first_name': 'Novo',
+            'last_name': 'Usuario',
+            'email': 'novo@example.com',
+            'password': 'Abc123456@!',
+            'password_confirm': 'Abc123456@!',
+        })
+
+        self.assertTrue(User.objects.filter(username='novousuario').exists())
+        self.assertEqual(versions, get_versions([GLOBAL_SCOPE, RELATED_SCOPE]))
+
+    def test_password_change_does_not_invalidate_pages(self):
+        recipe = self.make_recipe()
+        versions = get_versions([GLOBAL_SCOPE, RELATED_SCOPE])
+
+        recipe.author.set_password('OutraSenha123')
+        recipe.author.save()
+
+        self.assertEqual(versions, get_versions([GLOBAL_SCOPE, RELATED_SCOPE]))
+
+    def test_renaming_an_author_invalidates_pages_only_with_published_recipes(self):
+        draft = self.make_recipe(
+            is_published=False, author_data={'username': 'rascunhos'},
+        )
+        version = get_versions([GLOBAL_SCOPE])
+
+        draft.author.first_name = 'Outro'
+        draft.author.save()
+        self.assertEqual(version, get_versions([GLOBAL_SCOPE]))
+
+        published = self.make_recipe(slug='publicada')
+        version = get_versions([GLOBAL_SCOPE])
+
+        published.author.first_name = 'Outro'
+        published.author.save()
+        self.assertNotEqual(version, get_versions([GLOBAL_SCOPE]))
+
+    def test_renaming_a_category_invalidates_category_and_detail(self):
+        recipe = self.make_recipe(category_data={'name': 'Doces'})
+        category_url = reverse(
+            'recipes:category', kwargs={'category_id': recipe.category.id}
+        )
+        detail_url = reverse('recipes:recipe', kwargs={'id': recipe.id})
+        self.client.get(category_url)
+        self.client.get(detail_url)
+
+        recipe.category.name = 'Sobremesas'
+        recipe.category.save()
+
+        self.assertIn('Sobremesas', self.client.get(category_url).content.decode())
+        self.assertIn('Sobremesas', self.client.get(detail_url).content.decode())
+
+    def test_unpublishing_a_recipe_invalidates_its_detail_page(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', kwargs={'id': recipe.id})
+        self.client.get(url)
+
+        recipe.is_published = False
+        recipe.save()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_not_found_responses_are_not_cached(self):
+        url = reverse('recipes:recipe', kwargs={'id': 1})
+        self.client.get(url)
+        self.make_recipe()
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_authenticated_users_bypass_the_page_cache(self):
+        self.make_recipe()
+        self.client.get(reverse('recipes:home'))
+
+        self.make_author(username='leitor', password='Senha123')
+        self.client.login(username='leitor', password='Senha123')
+
+        for _ in range(2):
+            response = self.client.get(reverse('recipes:home'))
+            self.assertTemplateUsed(response, 'recipes/pages/home.html')
@@ -0,0 +1,101 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from recipes import rendering
+from recipes.models import Recipe
+from recipes.rendering import sanitize_html
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipePreparationStepsTest(RecipeTestBase):
+    def get_detail(self, recipe):
+        return self.client.get(
+            reverse('recipes:recipe', kwargs={'id': recipe.id})
+        ).content.decode('utf-8')
+
+    def test_plain_text_is_escaped_and_line_broken_on_save(self):
+        recipe = self.make_recipe(preparation_steps='Misture <b>\nAsse')
+
+        self.assertEqual(
+            recipe.preparation_steps_rendered,
+            'Misture &lt;b&gt;<br>Asse',
+        )
+
+    def test_html_is_sanitised_on_save(self):
+        recipe = self.make_recipe(
+            preparation_steps=(
+                '<p style="color:red">Asse</p>'
+                '<img src=x onerror="alert(1)"><script>alert(2)</script>'
+            ),
+            preparation_steps_is_html=True,
+        )
+
+        self.assertEqual(recipe.preparation_steps_rendered, '<p>Asse</p>')
+
+    def test_detail_page_outputs_the_rendered_column(self):
+        recipe = self.make_recipe(
+            preparation_steps='<ul><li>Asse</li></ul><script>alert(1)</script>',
+            preparation_steps_is_html=True,
+        )
+
+        content = self.get_detail(recipe)
+
+        self.assertIn('<ul><li>Asse</li></ul>', content)
+        self.assertNotIn('alert(1)', content)
+
+    def test_update_fields_with_the_source_also_saves_the_rendered_column(self):
+        recipe = self.make_recipe()
+        recipe.preparation_steps = 'Novo\npasso'
+        recipe.save(update_fields=['preparation_steps'])
+
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.preparation_steps_rendered, 'Novo<br>passo')
+
+    def test_sanitiser_keeps_safe_links_and_closes_open_tags(self):
+        self.assertEqual(
+            sanitize_html('<a href="https://x.com" target="_blank">x<em>y'),
+            '<a href="https://x.com" rel="nofollow noopener">x<em>y</em></a>',
+        )
+
+    def test_backfill_command_renders_only_missing_rows(self):
+        first = self.make_recipe(preparation_steps='a\nb')
+        second = self.make_recipe(
+            slug='outra', preparation_steps='c',
+            author_data={'username': 'outro'},
+        )
+        Recipe.objects.filter(pk=first.pk).update(preparation_steps_rendered='')
+        Recipe.objects.filter(pk=second.pk).update(
+            preparation_steps_rendered='antigo',
+        )
+
+        output = StringIO()
+        call_command('render_preparation_steps', chunk_size=1, stdout=output)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.preparation_steps_rendered, 'a<br>b')
+        self.assertEqual(second.preparation_steps_rendered, 'antigo')
+        self.assertIn('1 receita(s)', output.getvalue())
+
+        call_command('render_preparation_steps', force=True, stdout=output)
+        second.refresh_from_db()
+        self.assertEqual(second.preparation_steps_rendered, 'c')
+
+    def test_forced_re_render_reaches_the_cached_detail_card(self):
+        recipe = self.make_recipe(
+            preparation_steps='<p>Asse</p><hr>', preparation_steps_is_html=True,
+        )
+        self.assertIn('<hr>', self.get_detail(recipe))
+
+        # Simula uma lista de tags permitidas que deixou de aceitar <hr>
+        with patch.object(rendering, 'ALLOWED_TAGS',
+                          rendering.ALLOWED_TAGS - {'hr'}):
+            call_command(
+                'render_preparation_steps', force=True, stdout=StringIO(),
+            )
+
+        self.assertNotIn('<hr>', self.get_detail(recipe))
@@ -0,0 +1,32 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from recipes.management.commands.check_query_plans import (TABLE_SCAN,
+                                                           find_table_scans,
+                                                           view_querysets)
+from recipes.models import Recipe
+
+
+class RecipeQueryPlanTest(TestCase):
+    def test_view_queries_do_not_scan_whole_tables(self):
+        scans = find_table_scans(view_querysets())
+        self.assertEqual({}, scans)
+
+    def test_check_query_plans_command_succeeds(self):
+        stdout = StringIO()
+        call_command('check_query_plans', stdout=stdout)
+        self.assertIn('Todas as consultas usam indice.', stdout.getvalue())
+
+    def test_unindexed_query_is_reported_as_table_scan(self):
+        scans = find_table_scans({
+            'servings': Recipe.objects.filter(servings=3),
+        })
+        self.assertEqual(['recipes_recipe'], scans['servings'][0])
+
+    def test_index_scan_is_not_a_table_scan(self):
+        self.assertEqual(
+            [],
+            TABLE_SCAN.findall('SCAN recipes_recipe USING INDEX x_idx')
+        )
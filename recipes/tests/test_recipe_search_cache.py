@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from recipes import search_cache, search_index
+from recipes.caching import category_nav
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeSearchCacheTest(RecipeTestBase):
+    def test_result_ids_are_cached_per_term(self):
+        recipe = self.make_recipe(title='Bolo de fubá')
+
+        self.assertEqual(search_cache.result_ids('bolo'), [recipe.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(search_cache.result_ids('bolo'), [recipe.id])
+
+        self.assertEqual(
+            search_cache.stats(),
+            {'hits': 1, 'misses': 1, 'hit_ratio': 0.5},
+        )
+
+    def test_equivalent_terms_share_the_cache_entry(self):
+        if not search_index.is_enabled():
+            self.skipTest('FTS5 indisponivel')
+
+        self.make_recipe(title='Pão de queijo')
+        search_cache.result_ids('pão')
+
+        with self.assertNumQueries(0):
+            search_cache.result_ids('  PAO ')
+
+    def test_publishing_and_unpublishing_invalidate_cached_ids(self):
+        recipe = self.make_recipe(title='Bolo de fubá', is_published=False)
+        self.assertEqual(search_cache.result_ids('bolo'), [])
+
+        recipe.is_published = True
+        recipe.save()
+        self.assertEqual(search_cache.result_ids('bolo'), [recipe.id])
+
+        recipe.is_published = False
+        recipe.save()
+        self.assertEqual(search_cache.result_ids('bolo'), [])
+
+    def test_search_page_is_hydrated_with_a_single_query(self):
+        for i in range(3):
+            self.make_recipe(
+                title=f'Bolo {i}', slug=f'bolo-{i}',
+                author_data={'username': f'u{i}'},
+            )
+        search_cache.result_ids('bolo')
+        category_nav()
+
+        # Sessao/mensagens nao tocam no banco para anonimos: so o id__in
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('recipes:search') + '?q=bolo')
+
+        self.assertEqual(len(response.context['recipes']), 3)
+
+    def test_search_cache_stats_command(self):
+        self.make_recipe(title='Bolo de fubá')
+        search_cache.result_ids('bolo')
+        search_cache.result_ids('bolo')
+        out = StringIO()
+
+        call_command('search_cache_stats', '--reset', stdout=out)
+
+        self.assertIn('taxa de acerto: 50.0%', out.getvalue())
+        self.assertIsNone(search_cache.stats()['hit_ratio'])
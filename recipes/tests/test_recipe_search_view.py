@@ -1,8 +1,12 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
 from django.urls import resolve, reverse
 
-from recipes import views
+from recipes import search_index, views
 
-from .test_recipe_base import RecipeTestBase
+from .test_recipe_base import Recipe, RecipeTestBase
 
 
 class RecipeSearchViewTest(RecipeTestBase):
@@ -58,4 +62,92 @@ class RecipeSearchViewTest(RecipeTestBase):
         self.assertNotIn(recipe1, response2.context['recipes'])
         
         self.assertIn(recipe1, response_both.context['recipes'])
-        self.assertIn(recipe2, response_both.context['recipes'])
\ No newline at end of file
+        self.assertIn(recipe2, response_both.context['recipes'])
+
+    def collect_search_pages(self, search_term):
+        search_url = reverse('recipes:search') + f'?q={search_term}'
+        response = self.client.get(search_url)
+        found = [(r.title, r.id) for r in response.context['recipes']]
+
+        while response.context['recipes'].has_next():
+            page = response.context['recipes'].next_page_number()
+            response = self.client.get(f'{search_url}&page={page}')
+            found += [(r.title, r.id) for r in response.context['recipes']]
+
+        return found
+
+    def make_bolo_recipes(self):
+        titles = ['Bolo b', 'Bolo a', 'Bolo b', 'Bolo c', 'Bolo a']
+        for i, title in enumerate(titles):
+            self.make_recipe(
+                title=title, slug=f'bolo-{i}', author_data={'username': f'u{i}'}
+            )
+
+    @patch('recipes.views.PER_PAGE', new=2)
+    @patch('recipes.search_index.is_enabled', new=lambda: False)
+    def test_recipe_search_fallback_pages_follow_title_then_id(self):
+        self.make_bolo_recipes()
+        expected = [
+            (r.title, r.id) for r in
+            sorted(Recipe.objects.all(), key=lambda r: (r.title, r.id))
+        ]
+
+        self.assertEqual(expected, self.collect_search_pages('bolo'))
+
+    @patch('recipes.views.PER_PAGE', new=2)
+    def test_recipe_search_pages_cover_every_result_once(self):
+        self.make_bolo_recipes()
+        found = self.collect_search_pages('bolo')
+
+        self.assertEqual(len(found), 5)
+        self.assertEqual(
+            set(found),
+            set(Recipe.objects.values_list('title', 'id'))
+        )
+
+    def test_recipe_search_ignores_accents(self):
+        recipe = self.make_recipe(title='Pão de queijo', slug='pao-de-queijo')
+
+        response = self.client.get(reverse('recipes:search') + '?q=pao')
+        self.assertIn(recipe, response.context['recipes'])
+
+        response = self.client.get(reverse('recipes:search') + '?q=QUEIJÔ')
+        self.assertIn(recipe, response.context['recipes'])
+
+    def test_recipe_search_ranks_title_matches_first(self):
+        in_description = self.make_recipe(
+            title='Torta salgada', description='Fica otima com frango',
+            slug='torta', author_data={'username': 'u1'},
+        )
+        in_title = self.make_recipe(
+            title='Frango assado', slug='frango',
+            author_data={'username': 'u2'},
+        )
+
+        response = self.client.get(reverse('recipes:search') + '?q=frango')
+        self.assertEqual(
+            [in_title, in_description],
+            list(response.context['recipes'])
+        )
+
+    def test_recipe_search_finds_text_in_preparation_steps(self):
+        recipe = self.make_recipe(preparation_steps='Asse por 40 minutos')
+
+        response = self.client.get(reverse('recipes:search') + '?q=asse')
+        self.assertIn(recipe, response.context['recipes'])
+
+    def test_recipe_search_index_forgets_deleted_recipes(self):
+        recipe = self.make_recipe(title='Mousse', slug='mousse')
+        recipe.delete()
+
+        response = self.client.get(reverse('recipes:search') + '?q=mousse')
+        self.assertEqual(len(response.context['recipes']), 0)
+
+    def test_rebuild_search_index_command_restores_the_index(self):
+        recipe = self.make_recipe(title='Brigadeiro', slug='brigadeiro')
+        search_index.remove_recipe(recipe.id)
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        response = self.client.get(reverse('recipes:search') + '?q=brigadeiro')
+        self.assertIn(recipe, response.context['recipes'])
@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Max, Min
+
+from recipes import search_index
+from recipes.models import Category, Recipe
+from utils import factory
+
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeSeedCommandTest(RecipeTestBase):
+    def seed(self, **options):
+        call_command(
+            'seed_recipes', stdout=StringIO(), stderr=StringIO(), **options,
+        )
+
+    def test_seed_recipes_creates_users_categories_and_recipes(self):
+        self.seed(
+            recipes=50, users=5, categories=3, batch_size=7, chunk_size=20,
+            workers=1,
+        )
+
+        self.assertEqual(Recipe.objects.count(), 50)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Category.objects.count(), 3)
+
+    def test_seed_recipes_slugs_are_unique_across_runs(self):
+        self.make_recipe()
+        self.seed(recipes=20, users=2, categories=2, workers=1)
+        self.seed(recipes=20, users=2, categories=2, workers=1)
+
+        slugs = Recipe.objects.values_list('slug', flat=True)
+        self.assertEqual(len(set(slugs)), 41)
+
+    def test_seed_recipes_spreads_created_at(self):
+        self.seed(recipes=30, users=2, categories=2, days=30, workers=1)
+
+        dates = Recipe.objects.aggregate(Min('created_at'), Max('created_at'))
+        spread = dates['created_at__max'] - dates['created_at__min']
+        self.assertGreater(spread.days, 1)
+        self.assertLessEqual(spread.days, 30)
+
+    def test_seed_recipes_with_process_pool(self):
+        self.seed(
+            recipes=40, users=4, categories=2, chunk_size=10, workers=2,
+        )
+
+        self.assertEqual(Recipe.objects.count(), 40)
+
+    def test_seed_recipes_rebuilds_search_index(self):
+        if not search_index.is_enabled():
+            self.skipTest('FTS5 indisponivel')
+
+        self.seed(recipes=10, users=2, categories=2, workers=1)
+        recipe = Recipe.objects.filter(is_published=True).first()
+        found = search_index.search(
+            Recipe.objects.published(), recipe.title.split()[0],
+        )
+
+        self.assertIn(recipe, found)
+
+    def test_make_recipe_rows_is_deterministic_per_seed(self):
+        factory.init_seed_worker([1], [1])
+        first = factory.make_recipe_rows(7, 0, 3, 'abc')
+        second = factory.make_recipe_rows(7, 0, 3, 'abc')
+
+        self.assertEqual(
+            [row['title'] for row in first], [row['title'] for row in second],
+        )
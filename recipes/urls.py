@@ -6,6 +6,7 @@ app_name = 'recipes'
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('recipes/autocomplete/', views.autocomplete, name='autocomplete'),
     path('recipes/search/', views.search, name='search'),
     path('recipes/category/<int:category_id>/', views.category, name='category'),
     path('recipes/<int:id>/', views.recipe, name='recipe'),
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import async_views, views
+
+app_name = 'recipes'
+
+urlpatterns = [
+    path('', async_views.home, name='home'),
+    path('recipes/autocomplete/', views.autocomplete, name='autocomplete'),
+    path('recipes/search/', async_views.search, name='search'),
+    path('recipes/category/<int:category_id>/', async_views.category, name='category'),
+    path('recipes/<int:id>/', async_views.recipe, name='recipe'),
+]
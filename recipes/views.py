@@ -1,24 +1,39 @@
 import os
 
-from django.db.models import Q
+from django.http import JsonResponse
 from django.http.response import Http404
-from django.shortcuts import get_list_or_404, get_object_or_404, render
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+from django.views.decorators.cache import cache_control
 
+from project.ratelimit import Rate, rate_limit
 from utils.pagination import make_pagination
 
+from . import prefix_index, search_cache
+from .caching import (GLOBAL_SCOPE, PUBLISHED_COUNT_KEY, RELATED_SCOPE,
+                      published_category, versioned_page_cache)
+from .http_cache import (DETAIL_MAX_AGE, LISTING_MAX_AGE, cache_policy,
+                         category_validators, conditional_view,
+                         home_validators, recipe_validators)
 from .models import Recipe
 
 PER_PAGE = int(os.environ.get('PER_PAGE', 9))
 
+# Rajada de 30 buscas por IP, recarregando 30 por minuto
+SEARCH_RATE = Rate(30, 60)
+
+@cache_policy(LISTING_MAX_AGE)
+@conditional_view(home_validators)
+@versioned_page_cache(GLOBAL_SCOPE)
 def home(request):
-    recipes = Recipe.objects.filter(
-        is_published=True,
-    ).order_by('-id')
+    recipes = Recipe.objects.published_cards().order_by('-id')
 
     page_object, pagination_range = make_pagination(
         request,
         recipes,
         PER_PAGE,
+        cursor_ordering=['-id'],
+        count_cache_key=PUBLISHED_COUNT_KEY,
     )
 
     return render(request, 'recipes/pages/home.html', context={
@@ -26,29 +41,45 @@ def home(request):
         'pagination_range': pagination_range,
     })
 
+@cache_policy(LISTING_MAX_AGE)
+@conditional_view(category_validators)
+@versioned_page_cache('category:{category_id}', RELATED_SCOPE)
 def category(request, category_id):
-    recipes = get_list_or_404(
-        Recipe.objects.filter(
-            category__id=category_id,
-            is_published=True,
-        ).order_by('-id')
-    )
+    # Nome e total vem do snapshot da navegacao: categoria vazia ou
+    # inexistente da 404 sem consultar Recipe
+    category = published_category(category_id)
+
+    if category is None:
+        raise Http404()
+
+    recipes = Recipe.objects.published_cards().filter(
+        category__id=category_id,
+    ).order_by('-id')
 
     page_object, pagination_range = make_pagination(
         request,
         recipes,
         PER_PAGE,
+        cursor_ordering=['-id'],
+        count=category['published_count'],
     )
 
+    if not page_object:
+        raise Http404()
+
     return render(request, 'recipes/pages/category.html', context={
         'recipes': page_object,
-        'title': f'{recipes[0].category.name} - Categoria |',
+        'title': f'{category["name"]} - Categoria |',
         'pagination_range': pagination_range,
     })
 
+@cache_policy(DETAIL_MAX_AGE)
+@conditional_view(recipe_validators)
+@versioned_page_cache('recipe:{id}', RELATED_SCOPE)
 def recipe(request, id):
+    # Autor e categoria entram na chave do card e na pagina
     recipe = get_object_or_404(
-        Recipe,
+        Recipe.objects.select_related('author', 'category'),
         pk=id,
         is_published=True,
     )
@@ -59,25 +90,23 @@ def recipe(request, id):
         'title': f'{recipe.title} |'
     })
 
+@rate_limit('search', per_ip=SEARCH_RATE)
+@cache_policy(LISTING_MAX_AGE)
+@versioned_page_cache(GLOBAL_SCOPE)
 def search(request):
     search_term = request.GET.get('q', '').strip()
 
     if not search_term:
         raise Http404()
     
-    recipes = Recipe.objects.filter(
-        Q(
-            Q(title__icontains=search_term) | Q(
-            description__icontains=search_term)
-        ),
-        is_published=True,
-    ).order_by('title')
-    
+    # IDs em cache por termo normalizado (em ordem de title, id); a pagina e
+    # uma fatia da lista, sem OFFSET no banco, por isso a busca nao usa cursor
     page_object, pagination_range = make_pagination(
         request,
-        recipes,
+        search_cache.result_ids(search_term),
         PER_PAGE,
     )
+    search_cache.hydrate(page_object)
 
     return render(request, 'recipes/pages/search.html', {
         'page_title': f'Pesquisa por "{search_term}" |',
@@ -86,4 +115,20 @@ def search(request):
         'pagination_range': pagination_range,
         'additional_url_query': f'&q={search_term}',
         }
-    )
\ No newline at end of file
+    )
+
+
+# Sugestoes iguais para todos os visitantes: nada de sessao ou usuario aqui
+@cache_control(public=True, max_age=LISTING_MAX_AGE)
+def autocomplete(request):
+    suggestions = prefix_index.get_index().suggest(request.GET.get('q', '')[:100])
+
+    return JsonResponse({
+        'suggestions': [
+            {
+                **suggestion,
+                'url': reverse('recipes:recipe', kwargs={'id': suggestion['id']}),
+            }
+            for suggestion in suggestions
+        ],
+    })
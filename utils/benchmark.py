@@ -0,0 +1,322 @@
+"""
+Benchmark HTTP das rotas de recipes e authors. Usado pelo comando
+`python manage.py benchmark`; tudo roda localmente, sem rede externa.
+"""
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from project.warmup import named_url_patterns
+from recipes import search_index
+from recipes.models import Category, Recipe
+from utils import factory
+
+DATASET_SIZES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+BENCH_USERNAME = 'bench'
+BENCH_PASSWORD = 'Bench12345'
+# Prefixo dos usernames, categorias e slugs gerados (ver utils.factory)
+BENCH_PREFIX = 'bench'
+BENCH_SEED = 42
+
+Route = namedtuple('Route', 'name method url data auth')
+
+
+def percentile(values, pct):
+    """
+    Percentil pelo metodo nearest-rank.
+
+    >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 50)
+    5
+    >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 99)
+    10
+    """
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def seed_dataset(recipes, categories=50, users=500, batch_size=2000):
+    """
+    Gera o dataset com as mesmas funcoes de utils.factory usadas pelo
+    comando seed_recipes, com semente fixa: a mesma quantidade gera sempre
+    os mesmos dados. Os rascunhos ficam com a conta BENCH_USERNAME, usada
+    nas rotas autenticadas. Em um banco ja populado (--db-file) cria so o
+    que falta, a partir do que ja existe.
+    """
+    password = make_password(BENCH_PASSWORD)
+    bench_users = User.objects.filter(
+        username__startswith=f'{BENCH_PREFIX}-',
+    )
+    User.objects.bulk_create(
+        [
+            User(password=password, **row) for row in factory.make_user_rows(
+                BENCH_SEED, bench_users.count(),
+                max(0, users - bench_users.count()), BENCH_PREFIX,
+            )
+        ],
+        batch_size=batch_size,
+    )
+    bench_user, _ = User.objects.get_or_create(
+        username=BENCH_USERNAME, defaults={'password': password},
+    )
+
+    bench_categories = Category.objects.filter(
+        name__startswith=f'Categoria {BENCH_PREFIX}-',
+    )
+    Category.objects.bulk_create(
+        [
+            Category(**row) for row in factory.make_category_rows(
+                bench_categories.count(),
+                max(0, categories - bench_categories.count()), BENCH_PREFIX,
+            )
+        ],
+        batch_size=batch_size,
+    )
+
+    factory.init_seed_worker(
+        list(bench_users.values_list('id', flat=True)),
+        list(bench_categories.values_list('id', flat=True)),
+    )
+    first = Recipe.objects.filter(slug__contains=f'-{BENCH_PREFIX}-').count()
+
+    with factory.keep_timestamps(Recipe):
+        for start in range(first, recipes, batch_size):
+            rows = factory.make_recipe_rows(
+                BENCH_SEED + start, start, min(batch_size, recipes - start),
+                BENCH_PREFIX,
+            )
+            for row in rows:
+                if not row['is_published']:
+                    row['author_id'] = bench_user.id
+            Recipe.objects.bulk_create([Recipe(**row) for row in rows])
+
+    # bulk_create nao dispara sinais: indice de busca e contagens por
+    # categoria sao refeitos aqui
+    if search_index.is_enabled():
+        search_index.rebuild_index()
+    call_command('reconcile_category_counts', stdout=StringIO())
+
+
+def build_routes():
+    """Uma Route para cada URL nomeada de recipes e authors"""
+    recipe_id, category_id, title = Recipe.objects.published().values_list(
+        'id', 'category_id', 'title').first() or (1, 1, 'bolo')
+    # Os titulos vem do Faker: a busca usa uma palavra que existe no dataset
+    search_term = title.split()[0].lower()
+    draft_id = Recipe.objects.filter(
+        is_published=False, author__username=BENCH_USERNAME,
+    ).values_list('id', flat=True).first() or 1
+
+    kwargs_by_name = {
+        'recipes:category': {'category_id': category_id},
+        'recipes:recipe': {'id': recipe_id},
+        'authors:dashboard_recipe_edit': {'id': draft_id},
+    }
+    query_by_name = {
+        'recipes:search': f'?q={search_term}',
+        'recipes:autocomplete': f'?q={search_term[:3]}',
+    }
+    post_data_by_name = {
+        'authors:login_create': {
+            'username': BENCH_USERNAME, 'password': BENCH_PASSWORD,
+        },
+        # Email repetido: mede a validacao sem criar usuarios
+        'authors:register_create': {
+            'username': 'novo', 'first_name': 'Novo', 'last_name': 'Usuario',
+            'email': f'{BENCH_PREFIX}-0@example.com', 'password': 'Abc123456',
+            'password_confirm': 'Abc123456',
+        },
+    }
+    auth_routes = {
+        'authors:dashboard', 'authors:dashboard_recipe_edit', 'authors:logout',
+    }
+
+    routes = []
+    for name, converters in named_url_patterns():
+        if not name.startswith(('recipes:', 'authors:')):
+            continue
+
+        kwargs = kwargs_by_name.get(name) or {key: 1 for key in converters}
+        url = reverse(name, kwargs=kwargs) + query_by_name.get(name, '')
+        data = post_data_by_name.get(name)
+        routes.append(Route(
+            name=name,
+            method='POST' if data else 'GET',
+            url=url,
+            data=data,
+            auth=name in auth_routes,
+        ))
+
+    return routes
+
+
+def summarize(route, mode, concurrency, timings, statuses, wall_time,
+              queries=None):
+    result = {
+        'route': route.name,
+        'method': route.method,
+        'url': route.url,
+        'mode': mode,
+        'concurrency': concurrency,
+        'requests': len(timings),
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 99) * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'throughput_rps': round(len(timings) / wall_time, 2),
+        'status_codes': dict(Counter(statuses)),
+    }
+    if queries is not None:
+        result['queries_per_request'] = round(sum(queries) / len(queries), 2)
+    return result
+
+
+def _bench_user():
+    return User.objects.get(username=BENCH_USERNAME)
+
+
+def run_client_benchmark(routes, requests_per_route, cold_cache=False):
+    """Test client no proprio processo; conta as queries de cada requisicao"""
+    anonymous = Client()
+    authenticated = Client()
+    authenticated.force_login(_bench_user())
+    results = []
+
+    for route in routes:
+        timings, statuses, queries = [], [], []
+        wall_start = time.perf_counter()
+
+        for _ in range(requests_per_route):
+            # POST em cliente novo: login_create nao contamina os demais
+            if route.auth:
+                client = authenticated
+            elif route.method == 'POST':
+                client = Client()
+            else:
+                client = anonymous
+            if cold_cache:
+                cache.clear()
+
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                if route.method == 'POST':
+                    response = client.post(route.url, route.data)
+                else:
+                    response = client.get(route.url)
+                timings.append(time.perf_counter() - start)
+
+            statuses.append(response.status_code)
+            queries.append(len(captured))
+
+        results.append(summarize(
+            route, 'client', 1, timings, statuses,
+            time.perf_counter() - wall_start, queries,
+        ))
+
+    return results
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadedWSGIServer(
+        ('127.0.0.1', 0), QuietRequestHandler, allow_reuse_address=False,
+    )
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    # Mede a rota em si, nao a pagina para onde ela redireciona
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+opener = urllib.request.build_opener(NoRedirectHandler)
+
+
+def _fetch(url, cookie):
+    request = urllib.request.Request(url)
+    if cookie:
+        request.add_header('Cookie', cookie)
+
+    start = time.perf_counter()
+    try:
+        with opener.open(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    return time.perf_counter() - start, status
+
+
+def run_server_benchmark(routes, requests_per_route, concurrency_levels,
+                         cold_cache=False):
+    """
+    Servidor WSGI local com threads e clientes concorrentes. Apenas rotas GET,
+    ja que POST exigiria o fluxo de CSRF.
+    """
+    authenticated = Client()
+    authenticated.force_login(_bench_user())
+    session_cookie = f'sessionid={authenticated.cookies["sessionid"].value}'
+
+    server = start_server()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    results = []
+
+    try:
+        for concurrency in concurrency_levels:
+            for route in routes:
+                if route.method != 'GET':
+                    continue
+
+                cookie = session_cookie if route.auth else None
+                url = base_url + route.url
+                if cold_cache:
+                    cache.clear()
+
+                wall_start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    samples = list(executor.map(
+                        lambda _: _fetch(url, cookie),
+                        range(requests_per_route),
+                    ))
+                wall_time = time.perf_counter() - wall_start
+
+                results.append(summarize(
+                    route, 'server', concurrency,
+                    [timing for timing, _ in samples],
+                    [status for _, status in samples],
+                    wall_time,
+                ))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return results
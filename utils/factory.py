@@ -1,5 +1,9 @@
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from random import randint
 
+from django.utils.text import slugify
 from faker import Faker
 
 
@@ -31,6 +35,107 @@ def make_recipe():
         }
     }
 
+# Geracao em massa (comando seed_recipes e o dataset do benchmark). As
+# funcoes abaixo podem rodar nos processos do pool: nao acessam o banco e
+# devolvem dicts prontos para o bulk_create. Cada lote recebe a propria
+# semente, entao o resultado nao depende de qual processo executou o lote.
+_seed_state = {}
+
+
+@contextmanager
+def keep_timestamps(model):
+    """
+    bulk_create chama pre_save, e auto_now/auto_now_add sobrescreveriam as
+    datas geradas. Desliga os dois enquanto os lotes sao inseridos.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def init_seed_worker(author_ids, category_ids):
+    _seed_state['author_ids'] = author_ids
+    _seed_state['category_ids'] = category_ids
+
+
+def _seeded_faker(seed):
+    seeded = Faker('pt-BR')
+    seeded.seed_instance(seed)
+    return seeded, random.Random(seed)
+
+
+def make_category_rows(start, count, prefix):
+    """
+    >>> make_category_rows(3, 2, 'abc')
+    [{'name': 'Categoria abc-3'}, {'name': 'Categoria abc-4'}]
+    """
+    return [
+        {'name': f'Categoria {prefix}-{index}'}
+        for index in range(start, start + count)
+    ]
+
+
+def make_user_rows(seed, start, count, prefix):
+    seeded, _ = _seeded_faker(seed)
+    return [
+        {
+            'username': f'{prefix}-{index}',
+            'email': f'{prefix}-{index}@example.com',
+            'first_name': seeded.first_name(),
+            'last_name': seeded.last_name(),
+        }
+        for index in range(start, start + count)
+    ]
+
+
+def make_recipe_rows(seed, start, count, prefix, days=5 * 365,
+                     published_ratio=0.9, steps_chars=1000):
+    # Import local: o modulo tambem roda sozinho (python utils/factory.py)
+    from recipes.rendering import render_preparation_steps
+
+    seeded, rng = _seeded_faker(seed)
+    author_ids = _seed_state['author_ids']
+    category_ids = _seed_state['category_ids']
+    now = datetime.now(timezone.utc)
+    rows = []
+
+    for index in range(start, start + count):
+        title = seeded.sentence(nb_words=5).rstrip('.')
+        created_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+        steps = seeded.text(max_nb_chars=steps_chars)
+        rows.append({
+            'title': title,
+            'description': seeded.sentence(nb_words=12),
+            'slug': f'{slugify(title)[:30]}-{prefix}-{index}',
+            'preparation_time': rng.randint(5, 180),
+            'preparation_time_unit': 'Minutos',
+            'servings': rng.randint(1, 12),
+            'servings_unit': 'Porções',
+            'preparation_steps': steps,
+            # bulk_create nao passa pelo Recipe.save
+            'preparation_steps_rendered': render_preparation_steps(steps, False),
+            'is_published': rng.random() < published_ratio,
+            'created_at': created_at,
+            'updated_at': created_at,
+            'author_id': rng.choice(author_ids),
+            'category_id': rng.choice(category_ids),
+        })
+
+    return rows
+
+
 if __name__== '__main__':
     from pprint import pprint
     pprint(make_recipe())
\ No newline at end of file
@@ -1,6 +1,18 @@
 import math
+import os
 
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# Acima deste numero de pagina a navegacao passa a ser feita por cursor
+PAGE_NUMBER_LIMIT = int(os.environ.get('PAGE_NUMBER_LIMIT', 10))
+
+# Tempo maximo que um COUNT fica no cache caso algum sinal se perca
+COUNT_CACHE_TIMEOUT = int(os.environ.get('COUNT_CACHE_TIMEOUT', 60 * 15))
 
 
 def make_pagination_range(page_range, qtde_paginas, current_page):
@@ -32,18 +44,308 @@ def make_pagination_range(page_range, qtde_paginas, current_page):
         'last_page_out_of_range': stop_range < total_pages,
     }
 
-def make_pagination(request, queryset, per_page, qtde_paginas=4):
+
+class CachedCountPaginator(Paginator):
+    def __init__(self, object_list, per_page, count_cache_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        return cache.get_or_set(
+            self.count_cache_key,
+            lambda: Paginator.count.func(self),
+            COUNT_CACHE_TIMEOUT,
+        )
+
+
+# Tokens assinados: um ?cursor= montado a mao nao chega ao filtro
+CURSOR_SALT = 'utils.pagination.cursor'
+
+
+def encode_cursor(values, forward=True):
+    return signing.dumps({'v': values, 'f': forward}, salt=CURSOR_SALT)
+
+
+def decode_cursor(token):
+    """Retorna (values, forward) ou None se o token for invalido"""
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+        return list(data['v']), bool(data['f'])
+    except (signing.BadSignature, ValueError, TypeError, KeyError):
+        return None
+
+
+def _ordering_field(model, field_name):
+    *relations, name = field_name.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def clean_cursor_values(model, ordering, values):
+    """
+    Converte cada valor pelo campo da ordenacao; None se algum nao servir
+
+    >>> from recipes.models import Recipe
+    >>> clean_cursor_values(Recipe, ['-id'], ['12'])
+    [12]
+    >>> clean_cursor_values(Recipe, ['-id'], [None]) is None
+    True
+    """
+    # None viraria um filtro "campo < NULL", que o ORM recusa
+    if len(values) != len(ordering) or None in values:
+        return None
+
+    try:
+        cleaned = [
+            _ordering_field(model, field.lstrip('-')).clean(value, None)
+            for field, value in zip(ordering, values)
+        ]
+    except (FieldDoesNotExist, ValidationError, TypeError, ValueError,
+            OverflowError):
+        return None
+
+    # Inteiros fora de 64 bits estouram no driver do banco
+    if any(isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63
+           for value in cleaned):
+        return None
+
+    return cleaned
+
+
+def _cursor_values(obj, ordering):
+    return [getattr(obj, field.lstrip('-')) for field in ordering]
+
+
+def _keyset_filter(ordering, values, forward):
+    condition = Q()
+
+    for index, field in enumerate(ordering):
+        descending = field.startswith('-')
+        lookup = 'lt' if descending == forward else 'gt'
+        term = Q(**{f'{field.lstrip("-")}__{lookup}': values[index]})
+
+        for previous_field, previous_value in zip(ordering[:index], values):
+            term &= Q(**{previous_field.lstrip('-'): previous_value})
+
+        condition |= term
+
+    return condition
+
+
+def _reverse_ordering(ordering):
+    return [
+        field[1:] if field.startswith('-') else f'-{field}'
+        for field in ordering
+    ]
+
+
+class CursorPage:
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _cursor_queryset(queryset, per_page, ordering, cursor=None):
+    """
+    Retorna (queryset fatiado, forward, values) para a pagina do cursor;
+    busca um item a mais para saber se ha outra pagina.
+    """
+    decoded = decode_cursor(cursor) if cursor else None
+    values, forward = decoded if decoded else (None, True)
+
+    if values is not None:
+        values = clean_cursor_values(queryset.model, ordering, values)
+        if values is None:
+            forward = True
+
+    if values is None:
+        queryset = queryset.order_by(*ordering)
+    elif forward:
+        queryset = queryset.filter(
+            _keyset_filter(ordering, values, forward=True)
+        ).order_by(*ordering)
+    else:
+        queryset = queryset.filter(
+            _keyset_filter(ordering, values, forward=False)
+        ).order_by(*_reverse_ordering(ordering))
+
+    return queryset[:per_page + 1], forward, values
+
+
+def _cursor_result(object_list, per_page, ordering, forward, values):
+    has_more = len(object_list) > per_page
+    object_list = object_list[:per_page]
+
+    if forward:
+        has_next, has_previous = has_more, values is not None
+    else:
+        object_list.reverse()
+        has_next, has_previous = True, has_more
+
+    page_object = CursorPage(object_list, has_next, has_previous)
+
+    next_cursor = previous_cursor = None
+    if object_list and has_next:
+        next_cursor = encode_cursor(
+            _cursor_values(object_list[-1], ordering), forward=True
+        )
+    if object_list and has_previous:
+        previous_cursor = encode_cursor(
+            _cursor_values(object_list[0], ordering), forward=False
+        )
+
+    pagination_range = {
+        'pagination': [],
+        'current_page': None,
+        'first_page_out_of_range': has_previous,
+        'last_page_out_of_range': False,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor,
+    }
+
+    return page_object, pagination_range
+
+
+def make_cursor_pagination(queryset, per_page, ordering, cursor=None):
+    queryset, forward, values = _cursor_queryset(
+        queryset, per_page, ordering, cursor
+    )
+    return _cursor_result(list(queryset), per_page, ordering, forward, values)
+
+
+async def amake_cursor_pagination(queryset, per_page, ordering, cursor=None):
+    queryset, forward, values = _cursor_queryset(
+        queryset, per_page, ordering, cursor
+    )
+    object_list = [obj async for obj in queryset]
+    return _cursor_result(object_list, per_page, ordering, forward, values)
+
+
+def _current_page_number(request, cursor_ordering):
     try:
         current_page = int(request.GET.get('page', 1))
     except ValueError:
         current_page = 1
-    paginator = Paginator(queryset, per_page)
-    page_object = paginator.get_page(current_page)
+
+    if cursor_ordering:
+        current_page = min(current_page, PAGE_NUMBER_LIMIT)
+
+    return current_page
+
+
+def _numbered_pagination_range(paginator, page_object, current_page,
+                               qtde_paginas, cursor_ordering):
+    page_range = paginator.page_range
+
+    if cursor_ordering:
+        page_range = page_range[:PAGE_NUMBER_LIMIT]
 
     pagination_range = make_pagination_range(
-        page_range=paginator.page_range,
+        page_range=page_range,
         qtde_paginas=qtde_paginas,
         current_page=current_page,
     )
 
-    return page_object, pagination_range
\ No newline at end of file
+    pagination_range['next_cursor'] = None
+    pagination_range['previous_cursor'] = None
+
+    if (cursor_ordering and page_object.has_next()
+            and page_object.number == len(page_range)):
+        pagination_range['next_cursor'] = encode_cursor(
+            _cursor_values(page_object[-1], cursor_ordering)
+        )
+
+    return pagination_range
+
+
+def make_pagination(request, queryset, per_page, qtde_paginas=4,
+                    cursor_ordering=None, count_cache_key=None, count=None):
+    if cursor_ordering and request.GET.get('cursor'):
+        return make_cursor_pagination(
+            queryset,
+            per_page,
+            cursor_ordering,
+            cursor=request.GET.get('cursor'),
+        )
+
+    current_page = _current_page_number(request, cursor_ordering)
+
+    if count_cache_key:
+        paginator = CachedCountPaginator(queryset, per_page, count_cache_key)
+    else:
+        paginator = Paginator(queryset, per_page)
+    if count is not None:
+        # Total ja conhecido (ex.: Category.published_count): sem COUNT
+        paginator.__dict__['count'] = count
+    page_object = paginator.get_page(current_page)
+
+    pagination_range = _numbered_pagination_range(
+        paginator, page_object, current_page, qtde_paginas, cursor_ordering,
+    )
+
+    return page_object, pagination_range
+
+
+async def _acount(queryset, count_cache_key):
+    if not count_cache_key:
+        return await queryset.acount()
+
+    count = await cache.aget(count_cache_key)
+    if count is None:
+        count = await queryset.acount()
+        await cache.aadd(count_cache_key, count, COUNT_CACHE_TIMEOUT)
+
+    return count
+
+
+async def amake_pagination(request, queryset, per_page, qtde_paginas=4,
+                           cursor_ordering=None, count_cache_key=None,
+                           count=None):
+    """
+    Versao async de make_pagination: mesmo retorno, com o COUNT e a pagina
+    buscados pelo ORM assincrono.
+    """
+    if cursor_ordering and request.GET.get('cursor'):
+        return await amake_cursor_pagination(
+            queryset,
+            per_page,
+            cursor_ordering,
+            cursor=request.GET.get('cursor'),
+        )
+
+    current_page = _current_page_number(request, cursor_ordering)
+
+    paginator = Paginator(queryset, per_page)
+    # Preenche o cached_property para o Paginator nao chamar count() sync
+    if count is None:
+        count = await _acount(queryset, count_cache_key)
+    paginator.__dict__['count'] = count
+    page_object = paginator.get_page(current_page)
+    page_object.object_list = [obj async for obj in page_object.object_list]
+
+    pagination_range = _numbered_pagination_range(
+        paginator, page_object, current_page, qtde_paginas, cursor_ordering,
+    )
+
+    return page_object, pagination_range
@@ -0,0 +1,56 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from recipes.models import Category, Recipe
+from utils import benchmark, factory
+
+
+class BenchmarkTest(TestCase):
+    def setUp(self) -> None:
+        benchmark.seed_dataset(recipes=30, categories=3, users=3)
+
+    def test_seed_dataset_creates_published_recipes_and_drafts(self):
+        drafts = Recipe.objects.filter(is_published=False)
+
+        self.assertEqual(Recipe.objects.count(), 30)
+        self.assertTrue(drafts.exists())
+        self.assertFalse(
+            drafts.exclude(author__username=benchmark.BENCH_USERNAME).exists()
+        )
+
+    def test_seed_dataset_uses_the_seed_command_factory(self):
+        recipe = Recipe.objects.get(slug__endswith='-bench-0')
+
+        factory.init_seed_worker([recipe.author_id], [recipe.category_id])
+        [row] = factory.make_recipe_rows(benchmark.BENCH_SEED, 0, 1, 'bench')
+        self.assertEqual(recipe.title, row['title'])
+        self.assertEqual(recipe.preparation_steps, row['preparation_steps'])
+
+    def test_seeding_again_with_a_larger_size_adds_only_the_missing_rows(self):
+        benchmark.seed_dataset(recipes=45, categories=4, users=5)
+
+        self.assertEqual(Recipe.objects.count(), 45)
+        self.assertTrue(Recipe.objects.filter(slug__endswith='-bench-44'))
+        self.assertEqual(Category.objects.count(), 4)
+        self.assertEqual(User.objects.count(), 6)
+
+    def test_build_routes_covers_every_recipes_and_authors_route(self):
+        names = {route.name for route in benchmark.build_routes()}
+
+        self.assertIn('recipes:search', names)
+        self.assertIn('authors:dashboard_recipe_edit', names)
+        self.assertIn('authors:login_create', names)
+
+    def test_client_benchmark_reports_latency_and_queries(self):
+        results = benchmark.run_client_benchmark(
+            benchmark.build_routes(), requests_per_route=2,
+        )
+
+        for result in results:
+            self.assertEqual(result['requests'], 2)
+            self.assertIn('queries_per_request', result)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertTrue(
+                all(int(status) < 400 for status in result['status_codes']),
+                result,
+            )
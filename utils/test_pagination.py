@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from utils.pagination import make_pagination_range
+from utils.pagination import (decode_cursor, encode_cursor,
+                              make_pagination_range)
 
 
 class PaginationTest(TestCase):
@@ -77,4 +78,23 @@ class PaginationTest(TestCase):
             qtde_paginas=4,
             current_page=20,
         )['pagination']
-        self.assertEqual([17,18,19,20], pagination)
\ No newline at end of file
+        self.assertEqual([17,18,19,20], pagination)
+
+    def test_cursor_token_round_trip_keeps_values_and_direction(self):
+        token = encode_cursor(['Bolo de cenoura', 42], forward=False)
+        self.assertEqual(
+            (['Bolo de cenoura', 42], False),
+            decode_cursor(token)
+        )
+
+    def test_invalid_cursor_token_is_decoded_as_none(self):
+        self.assertIsNone(decode_cursor('nao-e-um-cursor'))
+        self.assertIsNone(decode_cursor(''))
+
+    def test_tampered_cursor_token_is_decoded_as_none(self):
+        token = encode_cursor([42])
+        payload, signature = token.rsplit(':', 1)
+        tampered = encode_cursor([41]).rsplit(':', 1)[0] + ':' + signature
+
+        self.assertEqual(([42], True), decode_cursor(token))
+        self.assertIsNone(decode_cursor(tampered))